@@ -477,6 +477,9 @@ class InferenceService:
         self.unload_security_classifier()
         self.unload_code_generator()
 
+        # Models are shared through the loader cache; release them there too
+        ModelLoader.clear_cache()
+
     def get_loaded_models(self) -> Dict[str, bool]:
         """
         Get status of loaded models.
@@ -74,6 +74,8 @@ class TrainModelRequest:
         max_grad_norm: Maximum gradient norm for clipping
         seed: Random seed
         resume_from: Optional checkpoint path to resume from
+        compile_mode: Optional torch.compile mode for the training forward
+            ('default', 'reduce-overhead', 'max-autotune'; None = eager)
     """
     dataset_path: str
     task: str = 'text_classification'
@@ -93,6 +95,7 @@ class TrainModelRequest:
     max_grad_norm: float = 1.0
     seed: int = 42
     resume_from: Optional[str] = None
+    compile_mode: Optional[str] = None
 
 
 @dataclass
@@ -226,7 +229,8 @@ class TrainModelUseCase:
                 data_path=request.dataset_path,
                 tokenizer=tokenizer,
                 task=request.task,
-                max_length=request.max_length
+                max_length=request.max_length,
+                model_type=model_manager.get_model_type().value
             )
             train_dataset, eval_dataset = dataset_loader.get_train_test_split(
                 test_size=request.validation_split,
@@ -268,7 +272,8 @@ class TrainModelUseCase:
                 max_grad_norm=request.max_grad_norm,
                 use_mixed_precision=request.use_mixed_precision,
                 early_stopping_patience=request.early_stopping_patience,
-                seed=request.seed
+                seed=request.seed,
+                compile_mode=request.compile_mode
             )
 
             # Step 7: Train model
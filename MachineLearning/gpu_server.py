@@ -136,9 +136,7 @@ async def load_models():
                 max_new_tokens=128,
                 do_sample=True,
                 temperature=0.8,
-                top_p=0.95,
-                num_beams=5,
-                early_stopping=True
+                top_p=0.95
             )
             inference_service.load_code_generator(
                 model_path=code_gen_path,
@@ -281,9 +279,7 @@ async def generate_code(request: CodeGenerationRequest):
             max_new_tokens=request.max_tokens,
             temperature=request.temperature,
             top_p=request.top_p,
-            do_sample=True,
-            num_beams=5,
-            early_stopping=True
+            do_sample=True
         )
 
         # Generate code using InferenceService
@@ -9,6 +9,7 @@ Supports:
 - Causal language models (GPT, CodeGen)
 - Configurable generation parameters
 - Batch generation
+- Incremental causal generation with KV-cache reuse
 
 Example:
     >>> from infrastructure.inference import CodeGenerator
@@ -18,13 +19,17 @@ Example:
     >>> print(code)
 """
 
+import copy
+import hashlib
 import logging
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from enum import Enum
 
 import torch
+import torch.nn.functional as F
 
-from infrastructure.inference.model_loader import ModelLoader
+from infrastructure.inference.model_loader import ModelLoader, inference_lock, move_to_device
 from domain.exceptions import InferenceError
 
 logger = logging.getLogger(__name__)
@@ -46,9 +51,12 @@ class GenerationConfig:
         temperature: Sampling temperature (0.0 to 2.0)
         top_p: Nucleus sampling parameter
         top_k: Top-k sampling parameter
-        num_beams: Number of beams for beam search
+        num_beams: Number of beams for beam search (1 = no beam search)
         num_return_sequences: Number of sequences to generate
         early_stopping: Whether to stop when all beams finish
+
+    Sampling and beam search are alternatives: sampling with num_beams > 1
+    runs beam-sample decoding, which pays for every beam on each step.
     """
 
     def __init__(
@@ -58,7 +66,7 @@ class GenerationConfig:
         temperature: float = 0.8,
         top_p: float = 0.95,
         top_k: int = 50,
-        num_beams: int = 5,
+        num_beams: int = 1,
         num_return_sequences: int = 1,
         early_stopping: bool = True
     ):
@@ -71,18 +79,44 @@ class GenerationConfig:
         self.num_return_sequences = num_return_sequences
         self.early_stopping = early_stopping
 
+    @classmethod
+    def for_model_type(cls, model_type: ModelType) -> 'GenerationConfig':
+        """
+        Get default generation settings for a model type.
+
+        Seq2seq models use deterministic beam search; causal models use
+        plain nucleus sampling without beams.
+
+        Args:
+            model_type: Generation model type
+
+        Returns:
+            GenerationConfig with defaults for the model type
+        """
+        if model_type == ModelType.SEQ2SEQ:
+            return cls(do_sample=False, num_beams=4, early_stopping=True)
+        return cls(do_sample=True, num_beams=1)
+
     def to_dict(self) -> Dict:
-        """Convert to dictionary for model.generate()."""
-        return {
+        """
+        Convert to dictionary for model.generate().
+
+        Only parameters relevant to the selected decoding strategy are
+        included, so generate() does not warn about ignored settings.
+        """
+        kwargs = {
             'max_new_tokens': self.max_new_tokens,
             'do_sample': self.do_sample,
-            'temperature': self.temperature,
-            'top_p': self.top_p,
-            'top_k': self.top_k,
             'num_beams': self.num_beams,
-            'num_return_sequences': self.num_return_sequences,
-            'early_stopping': self.early_stopping
+            'num_return_sequences': self.num_return_sequences
         }
+        if self.do_sample:
+            kwargs['temperature'] = self.temperature
+            kwargs['top_p'] = self.top_p
+            kwargs['top_k'] = self.top_k
+        if self.num_beams > 1:
+            kwargs['early_stopping'] = self.early_stopping
+        return kwargs
 
 
 class CodeGenerator:
@@ -105,13 +139,21 @@ class CodeGenerator:
         >>> code = generator.generate("create a binary search function")
     """
 
+    # Prefix KV caches are evicted while allocated GPU memory exceeds this
+    # fraction of the device total
+    PREFIX_CACHE_MEMORY_FRACTION = 0.8
+
     def __init__(
         self,
         model_path: str,
         model_type: Union[str, ModelType] = ModelType.SEQ2SEQ,
         config: Optional[GenerationConfig] = None,
         device: Optional[str] = None,
-        local_files_only: bool = False
+        local_files_only: bool = False,
+        compile_mode: Optional[str] = None,
+        encoder_cache_size: int = 32,
+        quantization: Optional[str] = None,
+        prefix_cache_size: int = 8
     ):
         """
         Initialize CodeGenerator.
@@ -119,9 +161,16 @@ class CodeGenerator:
         Args:
             model_path: Path to model checkpoint or HuggingFace model ID
             model_type: Type of model ('seq2seq' or 'causal')
-            config: Generation configuration (uses defaults if None)
+            config: Generation configuration (uses model type defaults if None)
             device: Optional device override
             local_files_only: Whether to load only from local files
+            compile_mode: Optional torch.compile mode (None = eager)
+            encoder_cache_size: Number of encoded prompts kept for seq2seq
+                models (0 disables the cache)
+            quantization: Optional weight quantization for causal models
+                ('int8' or 'nf4', CUDA + bitsandbytes only)
+            prefix_cache_size: Number of prefix KV caches kept for
+                generate_incremental() on causal models (0 disables the cache)
 
         Raises:
             InferenceError: If model loading fails
@@ -135,7 +184,7 @@ class CodeGenerator:
             self.model_type = model_type
 
             # Load model using ModelLoader
-            loader = ModelLoader(device=device)
+            loader = ModelLoader(device=device, compile_mode=compile_mode)
 
             if model_type == ModelType.SEQ2SEQ:
                 self.model, self.tokenizer = loader.load_seq2seq_model(
@@ -145,13 +194,23 @@ class CodeGenerator:
             elif model_type == ModelType.CAUSAL:
                 self.model, self.tokenizer = loader.load_causal_model(
                     model_path=model_path,
-                    local_files_only=local_files_only
+                    local_files_only=local_files_only,
+                    quantization=quantization
                 )
             else:
                 raise InferenceError(f"Unsupported model_type: {model_type}")
 
             self.device = loader.get_device()
-            self.config = config or GenerationConfig()
+            self._lock = inference_lock(self.model)
+            self.config = config or GenerationConfig.for_model_type(model_type)
+
+            # LRU cache of encoder outputs keyed by prompt token ids (seq2seq only)
+            self.encoder_cache_size = encoder_cache_size
+            self._encoder_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+
+            # LRU cache of (past_key_values, logits) keyed by prefix token ids (causal only)
+            self.prefix_cache_size = prefix_cache_size
+            self._prefix_cache: "OrderedDict[bytes, Tuple[Any, torch.Tensor]]" = OrderedDict()
 
             logger.info(
                 f"CodeGenerator ready: {model_type.value} model, "
@@ -161,6 +220,89 @@ class CodeGenerator:
         except Exception as e:
             raise InferenceError(f"Failed to initialize CodeGenerator: {e}")
 
+    def _prepare_prompt(self, prompt: str) -> Dict[str, Any]:
+        """
+        Tokenize a single prompt into generate() keyword arguments.
+
+        For seq2seq models the encoder output is computed once per distinct
+        prompt and reused from an LRU cache, so repeated calls with the same
+        prompt (e.g. sampling variations) skip the encoder forward.
+
+        Args:
+            prompt: Input prompt
+
+        Returns:
+            Keyword arguments for model.generate()
+        """
+        inputs = self.tokenizer(
+            prompt,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=512
+        )
+
+        key = None
+        if self.model_type == ModelType.SEQ2SEQ and self.encoder_cache_size > 0:
+            key = hashlib.blake2b(
+                inputs['input_ids'].numpy().tobytes(), digest_size=16
+            ).digest()
+
+        model_inputs = move_to_device(
+            {'input_ids': inputs['input_ids'], 'attention_mask': inputs['attention_mask']},
+            self.device
+        )
+
+        if key is not None:
+            # The lock also guards the LRU bookkeeping
+            with self._lock:
+                encoder_outputs = self._encoder_cache.get(key)
+                if encoder_outputs is None:
+                    with torch.inference_mode():
+                        encoder_outputs = self.model.get_encoder()(
+                            input_ids=model_inputs['input_ids'],
+                            attention_mask=model_inputs['attention_mask'],
+                            return_dict=True
+                        )
+                    self._encoder_cache[key] = encoder_outputs
+                    if len(self._encoder_cache) > self.encoder_cache_size:
+                        self._encoder_cache.popitem(last=False)
+                else:
+                    self._encoder_cache.move_to_end(key)
+
+            # generate() expands encoder outputs for beams in place, so hand it
+            # a shallow copy to keep the cached entry intact
+            model_inputs['encoder_outputs'] = type(encoder_outputs)(**encoder_outputs)
+
+        return model_inputs
+
+    def _decode(self, outputs: torch.Tensor, input_ids: torch.Tensor) -> List[str]:
+        """
+        Decode generated sequences, dropping the echoed prompt.
+
+        Causal models return prompt + continuation; the prompt tokens are
+        sliced off before decoding so only newly generated code is returned.
+        Seq2seq outputs contain no prompt and are decoded as-is.
+
+        Args:
+            outputs: Generated token ids [num_sequences, seq_len]
+            input_ids: Prompt token ids passed to generate()
+
+        Returns:
+            List of generated strings
+        """
+        if self.model_type == ModelType.CAUSAL:
+            # Prompts are left-padded, so all continuations start at the same index
+            outputs = outputs[:, input_ids.shape[1]:]
+
+        decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        return [text.strip() for text in decoded]
+
+    def clear_encoder_cache(self) -> None:
+        """Drop all cached seq2seq encoder outputs."""
+        with self._lock:
+            self._encoder_cache.clear()
+
     def generate(
         self,
         prompt: str,
@@ -183,31 +325,17 @@ class CodeGenerator:
         try:
             gen_config = config or self.config
 
-            # Tokenize input
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            model_inputs = self._prepare_prompt(prompt)
 
             # Generate
-            with torch.no_grad():
+            with self._lock, torch.inference_mode():
                 outputs = self.model.generate(
-                    input_ids=inputs['input_ids'],
-                    attention_mask=inputs['attention_mask'],
+                    **model_inputs,
                     **gen_config.to_dict()
                 )
 
             # Decode
-            generated = self.tokenizer.decode(
-                outputs[0],
-                skip_special_tokens=True
-            ).strip()
-
-            return generated
+            return self._decode(outputs[:1], model_inputs['input_ids'])[0]
 
         except Exception as e:
             raise InferenceError(f"Code generation failed: {e}")
@@ -251,23 +379,18 @@ class CodeGenerator:
                     truncation=True,
                     max_length=512
                 )
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                inputs = move_to_device(inputs, self.device)
 
                 # Generate
-                with torch.no_grad():
+                with self._lock, torch.inference_mode():
                     outputs = self.model.generate(
                         input_ids=inputs['input_ids'],
                         attention_mask=inputs['attention_mask'],
                         **gen_config.to_dict()
                     )
 
-                # Decode all outputs
-                for output in outputs:
-                    generated = self.tokenizer.decode(
-                        output,
-                        skip_special_tokens=True
-                    ).strip()
-                    results.append(generated)
+                # Decode all outputs in one call
+                results.extend(self._decode(outputs, inputs['input_ids']))
 
             except Exception as e:
                 logger.error(f"Batch generation failed: {e}")
@@ -310,44 +433,218 @@ class CodeGenerator:
             temperature=gen_config.temperature,
             top_p=gen_config.top_p,
             top_k=gen_config.top_k,
-            num_beams=max(gen_config.num_beams, num_sequences),
+            num_beams=1,  # Sampling already diversifies; beams would multiply cost
             num_return_sequences=num_sequences,
             early_stopping=gen_config.early_stopping
         )
 
         try:
-            # Tokenize
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            model_inputs = self._prepare_prompt(prompt)
 
             # Generate multiple sequences
-            with torch.no_grad():
+            with self._lock, torch.inference_mode():
                 outputs = self.model.generate(
-                    input_ids=inputs['input_ids'],
-                    attention_mask=inputs['attention_mask'],
+                    **model_inputs,
                     **multi_config.to_dict()
                 )
 
             # Decode all
-            results = []
-            for output in outputs:
-                generated = self.tokenizer.decode(
-                    output,
-                    skip_special_tokens=True
-                ).strip()
-                results.append(generated)
-
-            return results
+            return self._decode(outputs, model_inputs['input_ids'])
 
         except Exception as e:
             raise InferenceError(f"Multiple sequence generation failed: {e}")
 
+    def generate_incremental(
+        self,
+        text: str,
+        config: Optional[GenerationConfig] = None,
+        past_key_values: Optional[Any] = None,
+        prefix: Optional[str] = None
+    ) -> Tuple[str, Any]:
+        """
+        Generate a continuation while keeping the decoder KV cache.
+
+        Returns the attention cache covering everything seen so far (prompt
+        and generated tokens). Passing it back with the text that follows
+        resumes generation without recomputing the shared prefix, so a
+        follow-up call costs O(new tokens) instead of O(full context) -
+        useful for editor-style completion where the context only grows.
+
+        A passed-in cache is not modified: generation extends a copy, so one
+        cache can be resumed several times with different follow-ups.
+        Alternatively, a shared prefix can be given as text; its cache is
+        computed once and kept in an LRU keyed by the prefix token ids.
+
+        Args:
+            text: Prompt, or when resuming, only the text appended after
+                the context already covered by past_key_values or prefix
+            config: Optional generation config override (beams are not
+                supported here; decoding is greedy or sampled)
+            past_key_values: Cache returned by a previous call
+            prefix: Shared context served from the prefix cache
+                (exclusive with past_key_values)
+
+        Returns:
+            Tuple of (generated text, past_key_values for the next call)
+
+        Raises:
+            InferenceError: If the model is not causal or generation fails
+
+        Example:
+            >>> code, cache = generator.generate_incremental("def fibonacci(n):")
+            >>> more, cache = generator.generate_incremental("\n\ndef main():", past_key_values=cache)
+            >>> code, _ = generator.generate_incremental("    return", prefix=file_header)
+        """
+        if self.model_type != ModelType.CAUSAL:
+            raise InferenceError("Incremental generation requires a causal model")
+        if prefix is not None and past_key_values is not None:
+            raise InferenceError("Pass either prefix or past_key_values, not both")
+
+        try:
+            gen_config = config or self.config
+            resuming = past_key_values is not None or prefix is not None
+
+            # Special tokens (e.g. BOS) only belong at the start of the context
+            encoded = self.tokenizer(
+                text,
+                return_tensors="pt",
+                add_special_tokens=not resuming
+            )
+            input_ids = move_to_device({'input_ids': encoded['input_ids']}, self.device)['input_ids']
+
+            eos_token_id = self.tokenizer.eos_token_id
+            generated = []
+
+            with self._lock, torch.inference_mode():
+                logits = None
+                if prefix is not None:
+                    past_key_values, logits = self._cached_prefix(prefix)
+                elif past_key_values is not None:
+                    past_key_values = copy.deepcopy(past_key_values)
+
+                # Prefill: the cache covers text even with max_new_tokens=0
+                if input_ids.size(1) > 0:
+                    outputs = self.model(
+                        input_ids=input_ids,
+                        past_key_values=past_key_values,
+                        use_cache=True
+                    )
+                    past_key_values = outputs.past_key_values
+                    logits = outputs.logits[:, -1, :]
+                elif logits is None:
+                    raise InferenceError("Cannot resume generation without new text")
+
+                for _ in range(gen_config.max_new_tokens):
+                    next_token = self._select_next_token(logits, gen_config)
+                    if eos_token_id is not None and next_token.item() == eos_token_id:
+                        break
+
+                    generated.append(next_token)
+                    # Only the new token is fed back; the cache holds the rest
+                    outputs = self.model(
+                        input_ids=next_token.view(1, 1),
+                        past_key_values=past_key_values,
+                        use_cache=True
+                    )
+                    past_key_values = outputs.past_key_values
+                    logits = outputs.logits[:, -1, :]
+
+            if not generated:
+                return "", past_key_values
+
+            text_out = self.tokenizer.decode(torch.cat(generated), skip_special_tokens=True)
+            return text_out, past_key_values
+
+        except Exception as e:
+            raise InferenceError(f"Incremental generation failed: {e}")
+
+    def _cached_prefix(self, prefix: str) -> Tuple[Any, torch.Tensor]:
+        """
+        Get a private copy of the KV cache for a prefix, prefilling on a miss.
+
+        Cached entries are never handed out directly, since decoding extends
+        a cache in place. Must be called with the inference lock held.
+
+        Args:
+            prefix: Shared context text
+
+        Returns:
+            Tuple of (past_key_values copy, last-position logits)
+        """
+        prefix_ids = self.tokenizer(prefix, return_tensors="pt")['input_ids']
+        key = hashlib.blake2b(prefix_ids.numpy().tobytes(), digest_size=16).digest()
+
+        entry = self._prefix_cache.get(key)
+        if entry is None:
+            input_ids = move_to_device({'input_ids': prefix_ids}, self.device)['input_ids']
+            outputs = self.model(input_ids=input_ids, use_cache=True)
+            entry = (outputs.past_key_values, outputs.logits[:, -1, :])
+
+            if self.prefix_cache_size > 0:
+                self._prefix_cache[key] = entry
+                if len(self._prefix_cache) > self.prefix_cache_size:
+                    self._prefix_cache.popitem(last=False)
+                self._evict_prefixes_over_memory()
+        else:
+            self._prefix_cache.move_to_end(key)
+
+        past_key_values, logits = entry
+        return copy.deepcopy(past_key_values), logits
+
+    def _evict_prefixes_over_memory(self) -> None:
+        """Drop the oldest prefix caches while GPU memory use is above the limit."""
+        if self.device.type != 'cuda':
+            return
+
+        limit = self.PREFIX_CACHE_MEMORY_FRACTION * torch.cuda.get_device_properties(
+            self.device
+        ).total_memory
+        while len(self._prefix_cache) > 1 and torch.cuda.memory_allocated(self.device) > limit:
+            self._prefix_cache.popitem(last=False)
+            logger.debug("Evicted prefix cache entry, %d left", len(self._prefix_cache))
+
+    def clear_prefix_cache(self) -> None:
+        """Drop all cached causal prefix KV caches."""
+        with self._lock:
+            self._prefix_cache.clear()
+
+    def _select_next_token(
+        self,
+        logits: torch.Tensor,
+        config: GenerationConfig
+    ) -> torch.Tensor:
+        """
+        Pick the next token from last-position logits.
+
+        Args:
+            logits: Logits for the last position [1, vocab_size]
+            config: Generation config (greedy unless do_sample)
+
+        Returns:
+            Selected token id tensor of shape [1]
+        """
+        logits = logits.float()
+        if not config.do_sample:
+            return logits.argmax(dim=-1)
+
+        logits = logits / max(config.temperature, 1e-5)
+
+        if config.top_k and config.top_k > 0:
+            top_k = min(config.top_k, logits.size(-1))
+            kth_value = torch.topk(logits, top_k).values[..., -1, None]
+            logits = logits.masked_fill(logits < kth_value, float('-inf'))
+
+        if config.top_p < 1.0:
+            sorted_logits, sorted_indices = torch.sort(logits, descending=True)
+            sorted_probs = F.softmax(sorted_logits, dim=-1)
+            # Drop tokens once the cumulative mass before them exceeds top_p
+            remove = (sorted_probs.cumsum(dim=-1) - sorted_probs) > config.top_p
+            sorted_logits = sorted_logits.masked_fill(remove, float('-inf'))
+            logits = torch.full_like(logits, float('-inf')).scatter(-1, sorted_indices, sorted_logits)
+
+        probs = F.softmax(logits, dim=-1)
+        return torch.multinomial(probs, num_samples=1).squeeze(-1)
+
     def set_config(self, config: GenerationConfig) -> None:
         """
         Update generation configuration.
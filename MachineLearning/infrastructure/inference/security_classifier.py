@@ -25,7 +25,7 @@ from typing import Dict, List, Optional, Union
 import torch
 import torch.nn.functional as F
 
-from infrastructure.inference.model_loader import ModelLoader
+from infrastructure.inference.model_loader import ModelLoader, inference_lock, move_to_device
 from domain.exceptions import InferenceError
 
 logger = logging.getLogger(__name__)
@@ -57,7 +57,10 @@ class SecurityClassifier:
         label_names: Optional[List[str]] = None,
         device: Optional[str] = None,
         local_files_only: bool = True,
-        vulnerability_threshold: float = 0.5
+        vulnerability_threshold: float = 0.5,
+        compile_mode: Optional[str] = None,
+        quantize: bool = False,
+        jit_trace: bool = False
     ):
         """
         Initialize SecurityClassifier.
@@ -69,6 +72,9 @@ class SecurityClassifier:
             device: Optional device override
             local_files_only: Whether to load only from local files
             vulnerability_threshold: Confidence threshold for vulnerability detection
+            compile_mode: Optional torch.compile mode (None = eager)
+            quantize: Use dynamic INT8 quantization when running on CPU
+            jit_trace: Trace the model with TorchScript (for PyTorch without torch.compile)
 
         Raises:
             InferenceError: If model loading fails
@@ -77,13 +83,16 @@ class SecurityClassifier:
             logger.info(f"Initializing SecurityClassifier from {model_path}")
 
             # Load model using ModelLoader
-            loader = ModelLoader(device=device)
+            loader = ModelLoader(device=device, compile_mode=compile_mode)
             self.model, self.tokenizer = loader.load_classification_model(
                 model_path=model_path,
-                local_files_only=local_files_only
+                local_files_only=local_files_only,
+                quantize=quantize,
+                jit_trace=jit_trace
             )
 
             self.device = loader.get_device()
+            self._lock = inference_lock(self.model)
             self.label_names = label_names
             self.num_labels = self.model.config.num_labels
             self.vulnerability_threshold = vulnerability_threshold
@@ -139,17 +148,19 @@ class SecurityClassifier:
                 truncation=True,
                 max_length=512
             )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            inputs = move_to_device(inputs, self.device)
 
             # Inference
-            with torch.no_grad():
+            with self._lock, torch.inference_mode():
                 outputs = self.model(**inputs)
-                logits = outputs.logits
+                # Softmax in FP32 even when the model runs in half precision
+                logits = outputs.logits.float()
 
             # Get prediction
-            probs = F.softmax(logits, dim=-1)
-            pred_label = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0, pred_label].item()
+            # Single device -> host copy; everything below reads the CPU tensor
+            probs = F.softmax(logits, dim=-1)[0].cpu()
+            pred_label = int(probs.argmax())
+            confidence = float(probs[pred_label])
 
             # Determine vulnerability
             # Assumes label 0 = safe, label 1+ = vulnerable/suspicious
@@ -168,7 +179,7 @@ class SecurityClassifier:
                 result['confidence'] = confidence
 
             if return_all_scores:
-                result['scores'] = probs[0].cpu().tolist()
+                result['scores'] = probs.tolist()
 
             return result
 
@@ -213,17 +224,22 @@ class SecurityClassifier:
                     truncation=True,
                     max_length=512
                 )
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                inputs = move_to_device(inputs, self.device)
 
                 # Inference
-                with torch.no_grad():
+                with self._lock, torch.inference_mode():
                     outputs = self.model(**inputs)
-                    logits = outputs.logits
+                    logits = outputs.logits.float()
 
                 # Get predictions
                 probs = F.softmax(logits, dim=-1)
-                pred_labels = torch.argmax(probs, dim=-1).cpu().tolist()
-                confidences = probs.max(dim=-1).values.cpu().tolist()
+                confidences, pred_labels = probs.max(dim=-1)
+
+                # Single device -> host transfer for the whole batch
+                pred_labels, confidences = torch.stack(
+                    [pred_labels.to(confidences.dtype), confidences]
+                ).tolist()
+                pred_labels = [int(label) for label in pred_labels]
 
                 # Build results
                 for label, conf in zip(pred_labels, confidences):
@@ -25,7 +25,7 @@ from pathlib import Path
 import torch
 import torch.nn.functional as F
 
-from infrastructure.inference.model_loader import ModelLoader
+from infrastructure.inference.model_loader import ModelLoader, inference_lock, move_to_device
 from domain.exceptions import InferenceError
 
 logger = logging.getLogger(__name__)
@@ -54,7 +54,10 @@ class TextClassifier:
         model_path: str,
         label_names: Optional[List[str]] = None,
         device: Optional[str] = None,
-        local_files_only: bool = True
+        local_files_only: bool = True,
+        compile_mode: Optional[str] = None,
+        quantize: bool = False,
+        jit_trace: bool = False
     ):
         """
         Initialize TextClassifier.
@@ -64,6 +67,9 @@ class TextClassifier:
             label_names: Optional list of label names (e.g., ['python', 'java', 'javascript'])
             device: Optional device override
             local_files_only: Whether to load only from local files
+            compile_mode: Optional torch.compile mode (None = eager)
+            quantize: Use dynamic INT8 quantization when running on CPU
+            jit_trace: Trace the model with TorchScript (for PyTorch without torch.compile)
 
         Raises:
             InferenceError: If model loading fails
@@ -72,13 +78,16 @@ class TextClassifier:
             logger.info(f"Initializing TextClassifier from {model_path}")
 
             # Load model using ModelLoader
-            loader = ModelLoader(device=device)
+            loader = ModelLoader(device=device, compile_mode=compile_mode)
             self.model, self.tokenizer = loader.load_classification_model(
                 model_path=model_path,
-                local_files_only=local_files_only
+                local_files_only=local_files_only,
+                quantize=quantize,
+                jit_trace=jit_trace
             )
 
             self.device = loader.get_device()
+            self._lock = inference_lock(self.model)
             self.label_names = label_names
             self.num_labels = self.model.config.num_labels
 
@@ -108,7 +117,8 @@ class TextClassifier:
         Args:
             text: Input text to classify
             return_confidence: Whether to return confidence score
-            return_all_scores: Whether to return scores for all labels
+            return_all_scores: Whether to return scores for all labels.
+                With both disabled the softmax is skipped entirely.
 
         Returns:
             Dictionary with:
@@ -131,17 +141,23 @@ class TextClassifier:
                 truncation=True,
                 max_length=512
             )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            inputs = move_to_device(inputs, self.device)
 
             # Inference
-            with torch.no_grad():
+            with self._lock, torch.inference_mode():
                 outputs = self.model(**inputs)
-                logits = outputs.logits
+                # Softmax in FP32 even when the model runs in half precision
+                logits = outputs.logits.float()
 
             # Get prediction
-            probs = F.softmax(logits, dim=-1)
-            pred_label = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0, pred_label].item()
+            if return_confidence or return_all_scores:
+                # Single device -> host copy; everything below reads the CPU tensor
+                probs = F.softmax(logits, dim=-1)[0].cpu()
+                pred_label = int(probs.argmax())
+            else:
+                # Label only: argmax over logits is enough, skip the softmax
+                probs = None
+                pred_label = torch.argmax(logits, dim=-1).item()
 
             # Build result
             result = {
@@ -152,10 +168,10 @@ class TextClassifier:
                 result['label_name'] = self.label_names[pred_label]
 
             if return_confidence:
-                result['confidence'] = confidence
+                result['confidence'] = float(probs[pred_label])
 
             if return_all_scores:
-                result['scores'] = probs[0].cpu().tolist()
+                result['scores'] = probs.tolist()
 
             return result
 
@@ -197,17 +213,22 @@ class TextClassifier:
                     truncation=True,
                     max_length=512
                 )
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                inputs = move_to_device(inputs, self.device)
 
                 # Inference
-                with torch.no_grad():
+                with self._lock, torch.inference_mode():
                     outputs = self.model(**inputs)
-                    logits = outputs.logits
+                    logits = outputs.logits.float()
 
                 # Get predictions
                 probs = F.softmax(logits, dim=-1)
-                pred_labels = torch.argmax(probs, dim=-1).cpu().tolist()
-                confidences = probs.max(dim=-1).values.cpu().tolist()
+                confidences, pred_labels = probs.max(dim=-1)
+
+                # Single device -> host transfer for the whole batch
+                pred_labels, confidences = torch.stack(
+                    [pred_labels.to(confidences.dtype), confidences]
+                ).tolist()
+                pred_labels = [int(label) for label in pred_labels]
 
                 # Build results
                 for label, conf in zip(pred_labels, confidences):
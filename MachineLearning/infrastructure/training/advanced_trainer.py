@@ -5,8 +5,8 @@ Advanced Trainer
 Advanced training implementation with multi-GPU, mixed precision, and gradient accumulation.
 
 This component provides:
-- Multi-GPU training with DataParallel
-- Mixed precision training (FP16) for faster training
+- Multi-GPU training with DistributedDataParallel (launch with torchrun)
+- Mixed precision training (BF16 on Ampere+, FP16 otherwise) for faster training
 - Gradient accumulation for large effective batch sizes
 - Early stopping to prevent overfitting
 - Learning rate scheduling
@@ -37,17 +37,25 @@ Example:
     >>>
     >>> # Train
     >>> trainer.train()
+
+Multi-GPU training runs one process per GPU:
+    torchrun --nproc_per_node=4 train_advanced_impl.py ...
 """
 
+import contextlib
 import logging
+import os
 import time
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable, List
 from dataclasses import dataclass, field
 
 import torch
+import torch.distributed as dist
 import torch.nn as nn
+from torch.nn.parallel import DistributedDataParallel
 from torch.utils.data import DataLoader, Dataset
+from torch.utils.data.distributed import DistributedSampler
 from torch.optim import AdamW
 from torch.optim.lr_scheduler import get_linear_schedule_with_warmup
 
@@ -70,12 +78,16 @@ class TrainingConfig:
         warmup_steps: Number of warmup steps for learning rate
         gradient_accumulation_steps: Number of steps to accumulate gradients
         max_grad_norm: Maximum gradient norm for clipping
-        use_mixed_precision: Whether to use mixed precision (FP16)
+        use_mixed_precision: Whether to use mixed precision (BF16 or FP16)
         early_stopping_patience: Stop if no improvement for N epochs
+        early_stopping_min_delta: Minimum eval loss decrease that counts as improvement
         eval_steps: Evaluate every N steps
         save_steps: Save checkpoint every N steps
         logging_steps: Log metrics every N steps
         max_checkpoints: Maximum number of checkpoints to keep
+        gradient_checkpointing: Recompute activations in backward to save memory
+        dataloader_num_workers: Worker processes for data loading (0 = main process)
+        compile_mode: torch.compile mode for the model forward (None = eager)
     """
     output_dir: str
     num_epochs: int = 3
@@ -87,11 +99,15 @@ class TrainingConfig:
     max_grad_norm: float = 1.0
     use_mixed_precision: bool = False
     early_stopping_patience: int = 3
+    early_stopping_min_delta: float = 0.0
     eval_steps: Optional[int] = None
     save_steps: Optional[int] = None
     logging_steps: int = 10
     max_checkpoints: int = 3
     seed: int = 42
+    gradient_checkpointing: bool = False
+    dataloader_num_workers: int = 0
+    compile_mode: Optional[str] = None
 
     def __post_init__(self):
         """Validate configuration."""
@@ -103,6 +119,10 @@ class TrainingConfig:
             raise ConfigurationError("learning_rate must be positive")
         if self.gradient_accumulation_steps < 1:
             raise ConfigurationError("gradient_accumulation_steps must be at least 1")
+        if self.early_stopping_min_delta < 0:
+            raise ConfigurationError("early_stopping_min_delta must be non-negative")
+        if self.dataloader_num_workers < 0:
+            raise ConfigurationError("dataloader_num_workers must be non-negative")
 
 
 @dataclass
@@ -130,13 +150,58 @@ class TrainingState:
     total_train_time: float = 0.0
 
 
+class _CUDAPrefetcher:
+    """
+    Iterate a DataLoader, uploading the next batch on a side CUDA stream.
+
+    While the model runs on batch N, batch N+1 is already being copied to
+    the GPU, so host-to-device transfers overlap with compute. Needs a
+    DataLoader with pin_memory=True for the copies to be asynchronous.
+    """
+
+    def __init__(self, dataloader: DataLoader, device: str):
+        self.dataloader = dataloader
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(device=self.device)
+
+    def __len__(self) -> int:
+        return len(self.dataloader)
+
+    def _upload(self, batch: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        with torch.cuda.stream(self.stream):
+            return {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+
+    def __iter__(self):
+        iterator = iter(self.dataloader)
+        try:
+            next_batch = self._upload(next(iterator))
+        except StopIteration:
+            return
+
+        current_stream = torch.cuda.current_stream(self.device)
+        while next_batch is not None:
+            # Compute must not start before this batch's copy has finished
+            current_stream.wait_stream(self.stream)
+            batch = next_batch
+            for tensor in batch.values():
+                # Memory was allocated on the side stream but is used on this one
+                tensor.record_stream(current_stream)
+
+            try:
+                next_batch = self._upload(next(iterator))
+            except StopIteration:
+                next_batch = None
+
+            yield batch
+
+
 class AdvancedTrainer:
     """
     Advanced trainer with multi-GPU and mixed precision support.
 
     Features:
-    - Multi-GPU training with DataParallel
-    - Mixed precision (FP16) for faster training
+    - Multi-GPU training with DistributedDataParallel
+    - Mixed precision (BF16 on Ampere+, FP16 with loss scaling otherwise)
     - Gradient accumulation
     - Early stopping
     - Learning rate scheduling
@@ -150,6 +215,8 @@ class AdvancedTrainer:
         config: Training configuration
         device: Training device
         state: Training state
+        is_distributed: Whether running under torchrun with several processes
+        is_main_process: Whether this process is rank 0 (saves checkpoints)
 
     Example:
         >>> trainer = AdvancedTrainer(
@@ -177,12 +244,16 @@ class AdvancedTrainer:
         max_grad_norm: float = 1.0,
         use_mixed_precision: bool = False,
         early_stopping_patience: int = 3,
+        early_stopping_min_delta: float = 0.0,
         eval_steps: Optional[int] = None,
         save_steps: Optional[int] = None,
         logging_steps: int = 10,
         max_checkpoints: int = 3,
         seed: int = 42,
-        metrics_callback: Optional[Callable] = None
+        metrics_callback: Optional[Callable] = None,
+        gradient_checkpointing: bool = False,
+        dataloader_num_workers: int = 0,
+        compile_mode: Optional[str] = None
     ):
         """
         Initialize AdvancedTrainer.
@@ -199,14 +270,23 @@ class AdvancedTrainer:
             warmup_steps: Number of warmup steps
             gradient_accumulation_steps: Steps to accumulate gradients
             max_grad_norm: Maximum gradient norm for clipping
-            use_mixed_precision: Whether to use FP16
+            use_mixed_precision: Whether to use mixed precision (BF16 where
+                supported, which needs no GradScaler; FP16 otherwise)
             early_stopping_patience: Stop if no improvement for N epochs
+            early_stopping_min_delta: Minimum eval loss decrease that resets
+                the patience counter (filters out noise-level improvements)
             eval_steps: Evaluate every N steps (default: once per epoch)
             save_steps: Save checkpoint every N steps (default: once per epoch)
             logging_steps: Log metrics every N steps
             max_checkpoints: Maximum checkpoints to keep
             seed: Random seed
             metrics_callback: Optional callback for custom metrics tracking
+            gradient_checkpointing: Trade extra forward compute for lower
+                activation memory, allowing larger batch sizes
+            dataloader_num_workers: Worker processes for data loading. Keep 0
+                on Windows; on Linux 2-4 workers keep the GPU fed
+            compile_mode: Optional torch.compile mode ('default', 'reduce-overhead',
+                'max-autotune') to fuse the forward pass into fewer kernels
         """
         self.model = model
         self.train_dataset = train_dataset
@@ -225,11 +305,15 @@ class AdvancedTrainer:
             max_grad_norm=max_grad_norm,
             use_mixed_precision=use_mixed_precision,
             early_stopping_patience=early_stopping_patience,
+            early_stopping_min_delta=early_stopping_min_delta,
             eval_steps=eval_steps,
             save_steps=save_steps,
             logging_steps=logging_steps,
             max_checkpoints=max_checkpoints,
-            seed=seed
+            seed=seed,
+            gradient_checkpointing=gradient_checkpointing,
+            dataloader_num_workers=dataloader_num_workers,
+            compile_mode=compile_mode
         )
 
         # Initialize training state
@@ -239,19 +323,30 @@ class AdvancedTrainer:
         self._set_seed(seed)
 
         # Setup device and model
+        self.is_distributed = False
+        self.local_rank = 0
         self.device = self._setup_device()
+        self.is_main_process = not self.is_distributed or dist.get_rank() == 0
         self.model = self._setup_model()
 
+        # DataParallel gathers one loss per replica; reduce those on our side
+        self._reduce_replica_loss = isinstance(self.model, nn.DataParallel)
+
         # Create output directory
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.is_main_process:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
 
         # Initialize components
         self.optimizer = None
         self.scheduler = None
         self.scaler = None  # For mixed precision
+        self.amp_dtype = torch.float16
+        self._autocast_kwargs: Optional[Dict[str, Any]] = None
         self.train_dataloader = None
         self.eval_dataloader = None
+        self.train_sampler = None
+        self._steps_per_epoch = 0
 
         logger.info(
             f"AdvancedTrainer initialized: device={self.device}, "
@@ -274,10 +369,30 @@ class AdvancedTrainer:
         """
         Setup training device (CPU/GPU/Multi-GPU).
 
+        Under torchrun (WORLD_SIZE > 1) the process group is initialized and
+        each process binds to its LOCAL_RANK GPU.
+
         Returns:
             Device string
         """
-        if torch.cuda.is_available():
+        if int(os.environ.get('WORLD_SIZE', 1)) > 1:
+            self.is_distributed = True
+            self.local_rank = int(os.environ.get('LOCAL_RANK', 0))
+
+            if torch.cuda.is_available():
+                torch.cuda.set_device(self.local_rank)
+                device = f"cuda:{self.local_rank}"
+            else:
+                device = "cpu"
+
+            if not dist.is_initialized():
+                dist.init_process_group(backend="nccl" if device != "cpu" else "gloo")
+
+            logger.info(
+                f"Distributed training: rank {dist.get_rank()}/{dist.get_world_size()}, "
+                f"device={device}"
+            )
+        elif torch.cuda.is_available():
             device = "cuda"
             gpu_count = torch.cuda.device_count()
             logger.info(f"Using {gpu_count} GPU(s) for training")
@@ -297,30 +412,178 @@ class AdvancedTrainer:
         # Move model to device
         self.model.to(self.device)
 
-        # Enable multi-GPU if available
-        if self.device == "cuda" and torch.cuda.device_count() > 1:
+        use_data_parallel = (
+            not self.is_distributed
+            and self.device == "cuda"
+            and torch.cuda.device_count() > 1
+        )
+
+        if self.config.gradient_checkpointing:
+            if use_data_parallel:
+                # DataParallel re-replicates the module every forward, which
+                # breaks checkpoint recomputation on the replicas
+                logger.warning(
+                    "Gradient checkpointing is not supported with DataParallel, "
+                    "disabling it; launch with torchrun to use both"
+                )
+                self.config.gradient_checkpointing = False
+            else:
+                self._enable_gradient_checkpointing()
+
+        if self.config.compile_mode:
+            if use_data_parallel:
+                # Replicas copy __dict__, so the compiled bound forward would
+                # run the original module's weights on the wrong device
+                logger.warning(
+                    "torch.compile is not supported with DataParallel, "
+                    "training in eager mode; launch with torchrun to use both"
+                )
+            else:
+                self._compile_model()
+
+        # One process per GPU: gradients are all-reduced during backward
+        if self.is_distributed:
+            device_ids = [self.local_rank] if self.device != "cpu" else None
+            # Gradients alias the all-reduce buckets, saving one copy per step
+            self.model = DistributedDataParallel(
+                self.model,
+                device_ids=device_ids,
+                output_device=device_ids[0] if device_ids else None,
+                gradient_as_bucket_view=True
+            )
+            logger.info(f"Enabled DistributedDataParallel on {self.device}")
+        elif use_data_parallel:
+            # Single-process fallback; torchrun + DDP avoids its scatter/gather overhead
             self.model = nn.DataParallel(self.model)
-            logger.info(f"Enabled DataParallel for {torch.cuda.device_count()} GPUs")
+            logger.warning(
+                f"Using DataParallel for {torch.cuda.device_count()} GPUs; "
+                f"launch with torchrun for DistributedDataParallel"
+            )
 
         return self.model
 
+    def _enable_gradient_checkpointing(self) -> None:
+        """Enable activation checkpointing on the underlying HF model."""
+        model = self.model.module if hasattr(self.model, 'module') else self.model
+
+        if not hasattr(model, 'gradient_checkpointing_enable'):
+            logger.warning(
+                f"{type(model).__name__} does not support gradient checkpointing, ignoring"
+            )
+            return
+
+        try:
+            # Non-reentrant checkpointing works with DDP and torch.compile
+            model.gradient_checkpointing_enable(
+                gradient_checkpointing_kwargs={'use_reentrant': False}
+            )
+        except TypeError:
+            # Older transformers without gradient_checkpointing_kwargs
+            model.gradient_checkpointing_enable()
+
+        # KV cache is useless during training and conflicts with checkpointing
+        if getattr(model, 'config', None) is not None:
+            model.config.use_cache = False
+
+        logger.info("Enabled gradient checkpointing")
+
+    def _compile_model(self) -> None:
+        """
+        Compile the model forward with torch.compile.
+
+        Only forward is replaced so state_dict keys, save_pretrained() and
+        the DDP wrapper see the original module.
+        """
+        if not hasattr(torch, 'compile'):
+            logger.warning("torch.compile requires PyTorch 2.0+, training in eager mode")
+            return
+
+        # HF KV cache is unused in training and causes graph breaks
+        if getattr(self.model, 'config', None) is not None:
+            self.model.config.use_cache = False
+
+        mode = self.config.compile_mode
+        if mode == "reduce-overhead" and self.config.gradient_accumulation_steps > 1:
+            # CUDA graphs overwrite their static outputs on the next replay,
+            # which clobbers activations still needed by accumulated backwards
+            logger.warning(
+                "compile_mode='reduce-overhead' is incompatible with gradient "
+                "accumulation, using 'default'"
+            )
+            mode = "default"
+
+        self.model.forward = torch.compile(self.model.forward, mode=mode)
+        logger.info(f"Compiled model forward (mode={mode})")
+
+    def _get_loss(self, outputs) -> torch.Tensor:
+        """
+        Extract the scalar training loss from model outputs.
+
+        Args:
+            outputs: Model forward outputs
+
+        Returns:
+            Scalar loss tensor
+        """
+        loss = outputs.loss if hasattr(outputs, 'loss') else outputs[0]
+        if self._reduce_replica_loss:
+            loss = loss.mean()
+        return loss
+
+    def _make_loader(
+        self,
+        dataset: Dataset,
+        shuffle: bool,
+        sampler: Optional[DistributedSampler] = None
+    ) -> DataLoader:
+        """
+        Build a DataLoader with the trainer's worker and pinning settings.
+
+        Args:
+            dataset: Dataset to load (its collate_fn is used if present)
+            shuffle: Whether to shuffle (ignored when a sampler is given)
+            sampler: Optional distributed sampler
+
+        Returns:
+            Configured DataLoader
+        """
+        # Default of 0 workers keeps Windows compatibility
+        num_workers = self.config.dataloader_num_workers
+        worker_kwargs = (
+            {'persistent_workers': True, 'prefetch_factor': 4}
+            if num_workers > 0 else {}
+        )
+
+        return DataLoader(
+            dataset,
+            batch_size=self.config.batch_size,
+            shuffle=shuffle and sampler is None,
+            sampler=sampler,
+            num_workers=num_workers,
+            # Pinned host memory lets non_blocking copies run asynchronously
+            pin_memory=torch.device(self.device).type == "cuda",
+            collate_fn=getattr(dataset, 'collate_fn', None),
+            **worker_kwargs
+        )
+
     def _create_dataloaders(self) -> None:
         """Create train and eval dataloaders."""
-        self.train_dataloader = DataLoader(
-            self.train_dataset,
-            batch_size=self.config.batch_size,
-            shuffle=True,
-            num_workers=0,  # Windows compatibility
-            pin_memory=self.device == "cuda"
+        # Each rank sees its own shard of the data
+        self.train_sampler = (
+            DistributedSampler(self.train_dataset, shuffle=True, seed=self.config.seed)
+            if self.is_distributed else None
+        )
+        self.train_dataloader = self._make_loader(
+            self.train_dataset, shuffle=True, sampler=self.train_sampler
         )
 
         if self.eval_dataset is not None:
-            self.eval_dataloader = DataLoader(
-                self.eval_dataset,
-                batch_size=self.config.batch_size,
-                shuffle=False,
-                num_workers=0,
-                pin_memory=self.device == "cuda"
+            eval_sampler = (
+                DistributedSampler(self.eval_dataset, shuffle=False)
+                if self.is_distributed else None
+            )
+            self.eval_dataloader = self._make_loader(
+                self.eval_dataset, shuffle=False, sampler=eval_sampler
             )
 
         logger.info(
@@ -345,12 +608,27 @@ class AdvancedTrainer:
             }
         ]
 
-        self.optimizer = AdamW(
-            optimizer_grouped_parameters,
-            lr=self.config.learning_rate
-        )
+        # Fused CUDA kernel does the whole update in one launch per tensor
+        fused = torch.device(self.device).type == "cuda"
+        try:
+            self.optimizer = AdamW(
+                optimizer_grouped_parameters,
+                lr=self.config.learning_rate,
+                fused=fused
+            )
+        except (TypeError, RuntimeError) as e:
+            # PyTorch < 2.0 has no fused AdamW; foreach still batches the kernels
+            logger.debug("Fused AdamW unavailable (%s), using foreach", e)
+            fused = False
+            self.optimizer = AdamW(
+                optimizer_grouped_parameters,
+                lr=self.config.learning_rate,
+                foreach=True
+            )
 
-        logger.info(f"Created AdamW optimizer with lr={self.config.learning_rate}")
+        logger.info(
+            f"Created AdamW optimizer with lr={self.config.learning_rate}, fused={fused}"
+        )
 
     def _create_scheduler(self, num_training_steps: int) -> None:
         """
@@ -370,10 +648,46 @@ class AdvancedTrainer:
             f"total_steps={num_training_steps}"
         )
 
+    def _autocast(self):
+        """
+        Get autocast context for mixed precision forward passes.
+
+        Returns:
+            Autocast context manager (disabled when mixed precision is off)
+        """
+        # Resolved once; this runs for every batch
+        if self._autocast_kwargs is None:
+            self._autocast_kwargs = {
+                'device_type': torch.device(self.device).type,
+                'dtype': self.amp_dtype,
+                'enabled': self.config.use_mixed_precision and self.device != "cpu"
+            }
+        return torch.autocast(**self._autocast_kwargs)
+
     def _create_scaler(self) -> None:
-        """Create gradient scaler for mixed precision."""
-        if self.config.use_mixed_precision and self.device == "cuda":
-            self.scaler = torch.cuda.amp.GradScaler()
+        """
+        Select the autocast dtype and create a gradient scaler if needed.
+
+        Ampere+ GPUs (compute capability >= 8) train in BF16, whose FP32
+        exponent range makes loss scaling unnecessary. Older GPUs use FP16
+        with a GradScaler.
+        """
+        if not self.config.use_mixed_precision or torch.device(self.device).type != "cuda":
+            return
+
+        # The dtype is about to change; rebuild the autocast settings
+        self._autocast_kwargs = None
+
+        if torch.cuda.get_device_capability(self.device)[0] >= 8:
+            self.amp_dtype = torch.bfloat16
+            logger.info("Enabled mixed precision training (BF16)")
+        else:
+            self.amp_dtype = torch.float16
+            # torch.cuda.amp.GradScaler is deprecated in favour of torch.amp
+            if hasattr(torch.amp, 'GradScaler'):
+                self.scaler = torch.amp.GradScaler("cuda")
+            else:
+                self.scaler = torch.cuda.amp.GradScaler()
             logger.info("Enabled mixed precision training (FP16)")
 
     def train(self) -> Dict[str, Any]:
@@ -391,21 +705,20 @@ class AdvancedTrainer:
             self._create_dataloaders()
             self._create_optimizer()
 
-            # Calculate total steps
-            num_training_steps = (
-                len(self.train_dataloader)
-                * self.config.num_epochs
-                // self.config.gradient_accumulation_steps
-            )
+            # Calculate total steps once; len() walks the sampler on some loaders.
+            # A trailing partial accumulation window still ends in an update.
+            self._steps_per_epoch = len(self.train_dataloader)
+            updates_per_epoch = -(-self._steps_per_epoch // self.config.gradient_accumulation_steps)
+            num_training_steps = updates_per_epoch * self.config.num_epochs
 
             self._create_scheduler(num_training_steps)
             self._create_scaler()
 
             # Set default eval/save steps if not provided
             if self.config.eval_steps is None:
-                self.config.eval_steps = len(self.train_dataloader)
+                self.config.eval_steps = self._steps_per_epoch
             if self.config.save_steps is None:
-                self.config.save_steps = len(self.train_dataloader)
+                self.config.save_steps = self._steps_per_epoch
 
             # Start training
             self.state.is_training = True
@@ -423,6 +736,9 @@ class AdvancedTrainer:
             # Training loop
             for epoch in range(self.config.num_epochs):
                 self.state.epoch = epoch
+                if self.train_sampler is not None:
+                    # Reshuffle the shards differently every epoch
+                    self.train_sampler.set_epoch(epoch)
 
                 logger.info(f"\nEpoch {epoch + 1}/{self.config.num_epochs}")
 
@@ -435,7 +751,7 @@ class AdvancedTrainer:
 
                     # Check for improvement
                     current_metric = eval_metrics.get('eval_loss', float('inf'))
-                    if current_metric < self.state.best_metric:
+                    if current_metric < self.state.best_metric - self.config.early_stopping_min_delta:
                         self.state.best_metric = current_metric
                         self.state.best_epoch = epoch
                         self.state.patience_counter = 0
@@ -482,36 +798,61 @@ class AdvancedTrainer:
         Train for one epoch.
 
         Returns:
-            Training metrics
+            Training metrics (including peak_memory_mb on CUDA)
         """
         self.model.train()
 
-        total_loss = 0.0
+        # Accumulate on device; .item() per step would sync with the GPU
+        total_loss = torch.zeros((), device=self.device)
         num_batches = 0
 
-        for step, batch in enumerate(self.train_dataloader):
-            # Move batch to device
-            batch = {k: v.to(self.device) for k, v in batch.items()}
+        # Peak memory is read once per epoch, never inside the batch loop
+        use_cuda = torch.cuda.is_available() and str(self.device).startswith('cuda')
+        if use_cuda:
+            torch.cuda.reset_peak_memory_stats(self.device)
 
-            # Forward pass with mixed precision
-            if self.scaler is not None:
-                with torch.cuda.amp.autocast():
+        steps_per_epoch = self._steps_per_epoch
+
+        # On CUDA the next batch uploads on a side stream during this step
+        if use_cuda:
+            batches = _CUDAPrefetcher(self.train_dataloader, self.device)
+        else:
+            batches = (
+                {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+                for batch in self.train_dataloader
+            )
+
+        for step, batch in enumerate(batches):
+
+            # Under DDP, only all-reduce gradients on the step that updates weights
+            # The last batch closes the epoch's window so no gradients leak
+            # into the next epoch
+            is_update_step = (
+                (step + 1) % self.config.gradient_accumulation_steps == 0
+                or step + 1 == steps_per_epoch
+            )
+            sync_context = (
+                self.model.no_sync()
+                if self.is_distributed and not is_update_step
+                else contextlib.nullcontext()
+            )
+
+            with sync_context:
+                # Forward pass with mixed precision
+                with self._autocast():
                     outputs = self.model(**batch)
-                    loss = outputs.loss if hasattr(outputs, 'loss') else outputs[0]
-                    loss = loss / self.config.gradient_accumulation_steps
+                    loss = self._get_loss(outputs) / self.config.gradient_accumulation_steps
 
-                # Backward pass with scaling
-                self.scaler.scale(loss).backward()
-            else:
-                outputs = self.model(**batch)
-                loss = outputs.loss if hasattr(outputs, 'loss') else outputs[0]
-                loss = loss / self.config.gradient_accumulation_steps
-                loss.backward()
+                # Only FP16 needs loss scaling; BF16 and FP32 backprop directly
+                if self.scaler is not None:
+                    self.scaler.scale(loss).backward()
+                else:
+                    loss.backward()
 
-            total_loss += loss.item()
+            total_loss += loss.detach().float()
 
             # Update weights
-            if (step + 1) % self.config.gradient_accumulation_steps == 0:
+            if is_update_step:
                 # Clip gradients
                 if self.scaler is not None:
                     self.scaler.unscale_(self.optimizer)
@@ -519,22 +860,35 @@ class AdvancedTrainer:
                         self.model.parameters(),
                         self.config.max_grad_norm
                     )
+                    scale_before = self.scaler.get_scale()
                     self.scaler.step(self.optimizer)
                     self.scaler.update()
+                    # A lowered scale means inf/NaN grads and a skipped
+                    # optimizer step; keep the LR schedule in sync with it
+                    step_skipped = self.scaler.get_scale() < scale_before
                 else:
                     torch.nn.utils.clip_grad_norm_(
                         self.model.parameters(),
                         self.config.max_grad_norm
                     )
                     self.optimizer.step()
+                    step_skipped = False
 
-                self.scheduler.step()
-                self.optimizer.zero_grad()
+                if step_skipped:
+                    logger.debug("Skipped scheduler step after FP16 overflow at step %d", step)
+                else:
+                    self.scheduler.step()
+                # Drop grads instead of memset-ing them; backward reallocates
+                self.optimizer.zero_grad(set_to_none=True)
                 self.state.global_step += 1
 
                 # Logging
-                if self.state.global_step % self.config.logging_steps == 0:
-                    avg_loss = total_loss / (num_batches + 1)
+                # .item() syncs with the GPU, so skip it when nothing would be logged
+                if (
+                    self.state.global_step % self.config.logging_steps == 0
+                    and logger.isEnabledFor(logging.INFO)
+                ):
+                    avg_loss = total_loss.item() / (num_batches + 1)
                     logger.info(
                         f"Step {self.state.global_step}: loss={avg_loss:.4f}, "
                         f"lr={self.scheduler.get_last_lr()[0]:.2e}"
@@ -546,8 +900,14 @@ class AdvancedTrainer:
 
             num_batches += 1
 
-        avg_loss = total_loss / num_batches
-        return {'train_loss': avg_loss}
+        avg_loss = total_loss.item() / max(num_batches, 1)
+        metrics = {'train_loss': avg_loss}
+
+        if use_cuda:
+            metrics['peak_memory_mb'] = torch.cuda.max_memory_allocated(self.device) / (1024 * 1024)
+            logger.info(f"Epoch peak GPU memory: {metrics['peak_memory_mb']:.0f} MB")
+
+        return metrics
 
     def evaluate(self) -> Dict[str, float]:
         """
@@ -561,51 +921,100 @@ class AdvancedTrainer:
 
         self.model.eval()
 
-        total_loss = 0.0
+        # Accumulate on device so the loop never blocks on a host sync
+        total_loss = torch.zeros((), device=self.device)
+        all_preds: List[torch.Tensor] = []
+        all_labels: List[torch.Tensor] = []
         num_batches = 0
 
-        with torch.no_grad():
+        with torch.inference_mode(), self._autocast():
             for batch in self.eval_dataloader:
-                batch = {k: v.to(self.device) for k, v in batch.items()}
+                batch = {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
 
                 outputs = self.model(**batch)
-                loss = outputs.loss if hasattr(outputs, 'loss') else outputs[0]
-
-                total_loss += loss.item()
+                total_loss += self._get_loss(outputs).float()
                 num_batches += 1
 
-        avg_loss = total_loss / num_batches
-
-        logger.info(f"Evaluation: loss={avg_loss:.4f}")
+                # Accuracy only applies to classification (one label per sample)
+                labels = batch.get('labels')
+                logits = getattr(outputs, 'logits', None)
+                if labels is not None and logits is not None and labels.dim() == 1:
+                    all_preds.append(logits.argmax(dim=-1))
+                    all_labels.append(labels)
+
+            # Compare all predictions at once after the loop
+            if all_preds:
+                correct = (torch.cat(all_preds) == torch.cat(all_labels)).sum().float()
+                total = float(sum(len(p) for p in all_preds))
+            else:
+                correct = torch.zeros((), device=self.device)
+                total = 0.0
+
+            totals = torch.stack([
+                total_loss,
+                torch.tensor(float(num_batches), device=self.device),
+                correct,
+                torch.tensor(total, device=self.device)
+            ])
+
+        if self.is_distributed:
+            # Combine the per-rank shards so every rank sees identical metrics
+            dist.all_reduce(totals)
+
+        # Single device -> host transfer for all metrics
+        loss_sum, batch_count, correct, total = totals.tolist()
+
+        metrics = {'eval_loss': loss_sum / batch_count}
+        if total:
+            metrics['eval_accuracy'] = correct / total
+            logger.info(
+                f"Evaluation: loss={metrics['eval_loss']:.4f}, "
+                f"accuracy={metrics['eval_accuracy']:.4f}"
+            )
+        else:
+            logger.info(f"Evaluation: loss={metrics['eval_loss']:.4f}")
 
-        return {'eval_loss': avg_loss}
+        return metrics
 
     def _save_checkpoint(self, is_best: bool = False) -> None:
         """
         Save model checkpoint.
 
+        The best model is written on every improvement, so it only holds the
+        weights; optimizer and scheduler state (about twice the model size
+        for AdamW) go into the periodic resume checkpoints.
+
         Args:
             is_best: Whether this is the best model
         """
+        # Ranks hold identical weights under DDP; only rank 0 writes
+        if not self.is_main_process:
+            return
+
         checkpoint_name = "best_model.pt" if is_best else f"checkpoint-{self.state.global_step}.pt"
         checkpoint_path = self.output_dir / checkpoint_name
 
-        # Get model state dict (handle DataParallel)
+        # Get model state dict (handle DataParallel/DDP wrappers)
         model_state = (
             self.model.module.state_dict()
             if hasattr(self.model, 'module')
             else self.model.state_dict()
         )
 
-        torch.save({
+        checkpoint = {
             'epoch': self.state.epoch,
             'global_step': self.state.global_step,
             'model_state_dict': model_state,
-            'optimizer_state_dict': self.optimizer.state_dict(),
-            'scheduler_state_dict': self.scheduler.state_dict(),
-            'best_metric': self.state.best_metric,
-            'config': self.config
-        }, checkpoint_path)
+            'best_metric': self.state.best_metric
+        }
+        if not is_best:
+            checkpoint.update({
+                'optimizer_state_dict': self.optimizer.state_dict(),
+                'scheduler_state_dict': self.scheduler.state_dict(),
+                'config': self.config
+            })
+
+        torch.save(checkpoint, checkpoint_path)
 
         logger.info(f"Saved checkpoint: {checkpoint_path}")
 
@@ -38,9 +38,11 @@ Example:
     >>> model.load_state_dict(checkpoint['model_state_dict'])
 """
 
+import heapq
 import json
 import logging
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
@@ -48,15 +50,37 @@ import torch
 import torch.nn as nn
 
 from domain.exceptions import CheckpointError, ConfigurationError
+from infrastructure.utils.compat import DATACLASS_SLOTS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _load_checkpoint_file(path: Path, weights_only: bool = True) -> Dict[str, Any]:
+    """
+    Load a checkpoint file with tensors memory-mapped instead of read eagerly.
+
+    Args:
+        path: Checkpoint file path
+        weights_only: Restrict unpickling to tensors and primitive containers
+
+    Returns:
+        Checkpoint data
+    """
+    try:
+        return torch.load(path, map_location='cpu', mmap=True, weights_only=weights_only)
+    except RuntimeError:
+        # Legacy (non-zip) checkpoints cannot be memory-mapped
+        return torch.load(path, map_location='cpu', weights_only=weights_only)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CheckpointMetadata:
     """
     Checkpoint metadata.
 
+    Declared with ``__slots__`` where supported, since one instance is kept
+    per checkpoint and rebuilt on every metadata scan.
+
     Attributes:
         filename: Checkpoint filename
         epoch: Training epoch
@@ -112,7 +136,8 @@ class CheckpointManager:
         checkpoint_dir: str = 'models/checkpoints',
         max_checkpoints: int = 3,
         metric_name: str = 'eval_loss',
-        mode: str = 'min'
+        mode: str = 'min',
+        recover_from_disk: bool = False
     ):
         """
         Initialize CheckpointManager.
@@ -122,6 +147,9 @@ class CheckpointManager:
             max_checkpoints: Maximum number of checkpoints to keep
             metric_name: Metric name for comparison (e.g., 'eval_loss', 'eval_accuracy')
             mode: 'min' (lower is better) or 'max' (higher is better)
+            recover_from_disk: Adopt checkpoint files already in checkpoint_dir
+                when there is no readable metadata file. Off by default, since
+                adopted checkpoints become subject to cleanup
 
         Raises:
             ConfigurationError: If configuration is invalid
@@ -136,6 +164,7 @@ class CheckpointManager:
         self.max_checkpoints = max_checkpoints
         self.metric_name = metric_name
         self.mode = mode
+        self.recover_from_disk = recover_from_disk
 
         # Create checkpoint directory
         try:
@@ -158,11 +187,14 @@ class CheckpointManager:
         """
         Load checkpoint metadata from file.
 
+        Without a readable metadata file the history starts empty, unless
+        recover_from_disk was requested.
+
         Returns:
             List of checkpoint metadata
         """
         if not self.metadata_file.exists():
-            return []
+            return self.scan_checkpoints() if self.recover_from_disk else []
 
         try:
             with open(self.metadata_file, 'r', encoding='utf-8') as f:
@@ -177,8 +209,74 @@ class CheckpointManager:
 
         except Exception as e:
             logger.warning(f"Failed to load checkpoint metadata: {e}")
+            return self.scan_checkpoints() if self.recover_from_disk else []
+
+    def scan_checkpoints(self, max_workers: int = 8) -> List[CheckpointMetadata]:
+        """
+        Rebuild checkpoint metadata from the checkpoint files on disk.
+
+        Files are read in a thread pool: loading is I/O bound and tensors
+        are memory-mapped, so only the scalar fields are actually read.
+
+        Args:
+            max_workers: Maximum number of concurrent file reads
+
+        Returns:
+            List of checkpoint metadata sorted by step
+
+        Example:
+            >>> checkpoints = manager.scan_checkpoints()
+            >>> print(f"Found {len(checkpoints)} checkpoints on disk")
+        """
+        checkpoint_files = list(self.checkpoint_dir.glob('checkpoint_epoch*_step*.pt'))
+        if not checkpoint_files:
             return []
 
+        workers = max(1, min(max_workers, len(checkpoint_files)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._read_checkpoint_metadata, checkpoint_files))
+
+        checkpoints = sorted(
+            (cp for cp in results if cp is not None),
+            key=lambda cp: cp.step
+        )
+
+        # Restore best flag from metric values
+        if checkpoints:
+            pick = min if self.mode == 'min' else max
+            pick(checkpoints, key=lambda cp: cp.metric_value).is_best = True
+
+        logger.info(f"Recovered metadata for {len(checkpoints)} checkpoints from disk")
+        return checkpoints
+
+    def _read_checkpoint_metadata(self, checkpoint_path: Path) -> Optional[CheckpointMetadata]:
+        """
+        Read metadata fields from a single checkpoint file.
+
+        Args:
+            checkpoint_path: Checkpoint file path
+
+        Returns:
+            CheckpointMetadata or None if the file cannot be read
+        """
+        logger.debug("Reading checkpoint metadata from %s", checkpoint_path.name)
+        try:
+            data = _load_checkpoint_file(checkpoint_path)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable checkpoint {checkpoint_path.name}: {e}")
+            return None
+
+        metric_value = data.get('metric_value')
+        return CheckpointMetadata(
+            filename=checkpoint_path.name,
+            epoch=data.get('epoch', 0),
+            step=data.get('step', 0),
+            metric_value=metric_value if metric_value is not None else float('inf'),
+            metric_name=data.get('metric_name', self.metric_name),
+            timestamp=checkpoint_path.stat().st_mtime,
+            is_best=False
+        )
+
     def _save_metadata(self) -> None:
         """Save checkpoint metadata to file."""
         data = {
@@ -191,7 +289,7 @@ class CheckpointManager:
         with open(self.metadata_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
 
-        logger.debug(f"Saved metadata for {len(self.checkpoints)} checkpoints")
+        logger.debug("Saved metadata for %d checkpoints", len(self.checkpoints))
 
     def save_checkpoint(
         self,
@@ -291,6 +389,7 @@ class CheckpointManager:
 
             # Save a copy as best_model.pt
             best_model_path = self.checkpoint_dir / 'best_model.pt'
+            # copy2 uses sendfile/fcopyfile where available and keeps metadata
             shutil.copy2(checkpoint_path, best_model_path)
             logger.info(f"New best model! Metric: {metric_value:.4f}")
 
@@ -333,19 +432,19 @@ class CheckpointManager:
         if len(self.checkpoints) <= self.max_checkpoints:
             return
 
-        # Sort checkpoints by metric value
-        sorted_checkpoints = sorted(
+        # Select best N checkpoints in O(N log k) without sorting the full list
+        select = heapq.nsmallest if self.mode == 'min' else heapq.nlargest
+        checkpoints_to_keep = select(
+            self.max_checkpoints,
             self.checkpoints,
-            key=lambda cp: cp.metric_value,
-            reverse=(self.mode == 'max')
+            key=lambda cp: cp.metric_value
         )
-
-        # Keep best N checkpoints
-        checkpoints_to_keep = sorted_checkpoints[:self.max_checkpoints]
-        checkpoints_to_remove = sorted_checkpoints[self.max_checkpoints:]
+        keep_filenames = frozenset(cp.filename for cp in checkpoints_to_keep)
 
         # Remove checkpoint files
-        for cp in checkpoints_to_remove:
+        for cp in self.checkpoints:
+            if cp.filename in keep_filenames:
+                continue
             checkpoint_path = self.checkpoint_dir / cp.filename
             if checkpoint_path.exists():
                 checkpoint_path.unlink()
@@ -354,12 +453,17 @@ class CheckpointManager:
         # Update checkpoint list
         self.checkpoints = checkpoints_to_keep
 
-    def load_checkpoint(self, filename: str) -> Dict[str, Any]:
+    def load_checkpoint(self, filename: str, weights_only: bool = True) -> Dict[str, Any]:
         """
         Load a specific checkpoint.
 
+        Tensors are memory-mapped, so only the parts that are accessed are
+        read from disk.
+
         Args:
             filename: Checkpoint filename
+            weights_only: Restrict unpickling to tensors and primitive types
+                (set to False for checkpoints with custom objects in extra_state)
 
         Returns:
             Checkpoint data
@@ -377,7 +481,7 @@ class CheckpointManager:
             raise CheckpointError(f"Checkpoint not found: {filename}")
 
         try:
-            checkpoint = torch.load(checkpoint_path, map_location='cpu')
+            checkpoint = _load_checkpoint_file(checkpoint_path, weights_only=weights_only)
             logger.info(f"Loaded checkpoint: {filename}")
             return checkpoint
         except Exception as e:
@@ -402,7 +506,7 @@ class CheckpointManager:
             return None
 
         try:
-            checkpoint = torch.load(best_model_path, map_location='cpu')
+            checkpoint = _load_checkpoint_file(best_model_path)
             logger.info("Loaded best model checkpoint")
             return checkpoint
         except Exception as e:
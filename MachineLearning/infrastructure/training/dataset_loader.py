@@ -40,25 +40,28 @@ Example:
     >>> train_loader = DataLoader(train_dataset, batch_size=8, shuffle=True)
 """
 
+import copy
+import hashlib
 import json
 import logging
+import random
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
-from enum import Enum
 
 import torch
+import torch.nn.functional as F
+from torch.nn.utils.rnn import pad_sequence
 from torch.utils.data import Dataset
 
 from domain.exceptions import DatasetError, ConfigurationError
+from infrastructure.training.model_manager import ModelType, TaskType
 
-logger = logging.getLogger(__name__)
-
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class TaskType(Enum):
-    """Supported ML tasks."""
-    TEXT_CLASSIFICATION = "text_classification"
-    CODE_GENERATION = "code_generation"
-    SECURITY_CLASSIFICATION = "security_classification"
+logger = logging.getLogger(__name__)
 
 
 class CodeDataset(Dataset):
@@ -73,6 +76,8 @@ class CodeDataset(Dataset):
         task: Task type
         max_length: Maximum sequence length
         label_map: Optional mapping from labels to indices
+        model_type: Optional model architecture (causal LM packs prompt + target)
+        encodings: Pre-tokenized, unpadded per-sample tensors (input_ids, labels)
 
     Example:
         >>> dataset = CodeDataset(
@@ -82,7 +87,7 @@ class CodeDataset(Dataset):
         ...     max_length=512
         ... )
         >>> sample = dataset[0]
-        >>> print(sample['input_ids'].shape)  # torch.Size([512])
+        >>> print(sample['input_ids'].shape)  # torch.Size([<tokens in sample>])
     """
 
     def __init__(
@@ -91,7 +96,10 @@ class CodeDataset(Dataset):
         tokenizer,
         task: str,
         max_length: int = 512,
-        label_map: Optional[Dict[str, int]] = None
+        label_map: Optional[Dict[str, int]] = None,
+        pad_to_multiple_of: Optional[int] = 8,
+        cache_dir: Optional[str] = None,
+        model_type: Optional[str] = None
     ):
         """
         Initialize CodeDataset.
@@ -102,6 +110,15 @@ class CodeDataset(Dataset):
             task: Task type (text_classification, code_generation, security_classification)
             max_length: Maximum sequence length
             label_map: Optional mapping from label strings to indices
+            pad_to_multiple_of: Round batch sequence length up to a multiple
+                of this value so GEMMs stay aligned to Tensor Core tiles
+                (None to disable)
+            cache_dir: Directory for caching tokenized samples between runs
+                (None to always tokenize)
+            model_type: Model architecture ('causal', 'seq2seq', 'classification').
+                For causal code generation, prompt and target are packed into
+                one sequence and the prompt positions are masked out of the
+                labels; otherwise input and target are encoded separately
 
         Raises:
             ConfigurationError: If task is unsupported
@@ -115,6 +132,14 @@ class CodeDataset(Dataset):
                 details={'task': task, 'supported_tasks': [t.value for t in TaskType]}
             )
 
+        try:
+            self.model_type = ModelType(model_type) if model_type is not None else None
+        except ValueError:
+            raise ConfigurationError(
+                f"Unsupported model type: {model_type}",
+                details={'model_type': model_type, 'supported_types': [t.value for t in ModelType]}
+            )
+
         if not samples:
             raise DatasetError("Cannot create dataset from empty samples list")
 
@@ -122,6 +147,10 @@ class CodeDataset(Dataset):
         self.tokenizer = tokenizer
         self.max_length = max_length
         self.label_map = label_map
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+        # Cache pad id once instead of looking it up on every batch
+        self._pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
 
         # Validate samples format
         self._validate_samples()
@@ -133,6 +162,9 @@ class CodeDataset(Dataset):
         ]:
             self.label_map = self._create_label_map()
 
+        # Tokenize all samples once up front instead of per __getitem__
+        self.encodings = self._load_or_tokenize(cache_dir)
+
         logger.info(
             f"CodeDataset initialized: task={self.task.value}, "
             f"samples={len(self.samples)}, max_length={self.max_length}"
@@ -193,6 +225,36 @@ class CodeDataset(Dataset):
         logger.info(f"Created label map: {label_map}")
         return label_map
 
+    def subset(self, indices: List[int]) -> 'CodeDataset':
+        """
+        Create a dataset over a subset of samples without re-tokenizing.
+
+        The subset shares this dataset's tokenizer, label map and encodings.
+
+        Args:
+            indices: Sample indices to keep
+
+        Returns:
+            CodeDataset containing only the selected samples
+
+        Example:
+            >>> train_ds = dataset.subset(list(range(800)))
+        """
+        subset = copy.copy(self)
+        subset.samples = [self.samples[i] for i in indices]
+
+        labels = self.encodings['labels']
+        subset.encodings = {
+            'input_ids': [self.encodings['input_ids'][i] for i in indices],
+            'labels': (
+                labels[torch.as_tensor(indices, dtype=torch.long)]
+                if isinstance(labels, torch.Tensor)
+                else [labels[i] for i in indices]
+            )
+        }
+
+        return subset
+
     def __len__(self) -> int:
         """Get dataset size."""
         return len(self.samples)
@@ -212,93 +274,260 @@ class CodeDataset(Dataset):
             >>> sample.keys()
             dict_keys(['input_ids', 'attention_mask', 'labels'])
         """
-        sample = self.samples[idx]
+        input_ids = self.encodings['input_ids'][idx]
+        return {
+            'input_ids': input_ids,
+            'attention_mask': torch.ones_like(input_ids),
+            'labels': self.encodings['labels'][idx]
+        }
 
-        if self.task == TaskType.CODE_GENERATION:
-            return self._prepare_generation_sample(sample)
+    def collate_fn(self, batch: List[Dict[str, torch.Tensor]]) -> Dict[str, torch.Tensor]:
+        """
+        Collate samples into a batch, padding only up to the longest sequence.
+
+        Samples are stored unpadded, so each batch costs attention over its
+        own longest sequence instead of max_length. Padded label positions
+        are set to -100 so the loss ignores them.
+
+        Args:
+            batch: List of samples from __getitem__
+
+        Returns:
+            Batched tensors with input_ids, attention_mask and labels
+
+        Example:
+            >>> loader = DataLoader(dataset, batch_size=8, collate_fn=dataset.collate_fn)
+        """
+        sequences = [x['input_ids'] for x in batch]
+        input_ids = self._pad_batch(sequences, self._pad_id)
+
+        # Build the mask from lengths in one vectorized op instead of
+        # padding a per-sample ones tensor
+        lengths = torch.tensor([len(seq) for seq in sequences])
+        positions = torch.arange(input_ids.size(1))
+        attention_mask = (positions.unsqueeze(0) < lengths.unsqueeze(1)).long()
+
+        labels = [x['labels'] for x in batch]
+        if labels[0].dim() == 0:
+            # Classification: one label per sample
+            labels = torch.stack(labels)
         else:
-            return self._prepare_classification_sample(sample)
+            # Generation targets are token sequences
+            labels = self._pad_batch(labels, -100)
+
+        return {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'labels': labels
+        }
 
-    def _prepare_classification_sample(self, sample: Dict[str, Any]) -> Dict[str, torch.Tensor]:
+    def _pad_batch(self, sequences: List[torch.Tensor], padding_value: int) -> torch.Tensor:
         """
-        Prepare classification sample.
+        Right-pad 1D sequences to the batch maximum, rounded up to pad_to_multiple_of.
 
         Args:
-            sample: Sample with 'code' and 'label'
+            sequences: Unpadded token sequences
+            padding_value: Value for padded positions
 
         Returns:
-            Tokenized sample with labels
+            Tensor of shape [batch, aligned_length]
         """
-        # Tokenize code
-        encoding = self.tokenizer(
-            sample['code'],
-            max_length=self.max_length,
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
+        padded = pad_sequence(sequences, batch_first=True, padding_value=padding_value)
 
-        # Get label index
-        label_str = sample['label']
-        label_idx = self.label_map.get(label_str, 0)
+        multiple = self.pad_to_multiple_of
+        if multiple:
+            length = max(padded.size(1), 1)
+            extra = -(-length // multiple) * multiple - padded.size(1)
+            if extra:
+                padded = F.pad(padded, (0, extra), value=padding_value)
 
-        return {
-            'input_ids': encoding['input_ids'].squeeze(0),
-            'attention_mask': encoding['attention_mask'].squeeze(0),
-            'labels': torch.tensor(label_idx, dtype=torch.long)
-        }
+        return padded
 
-    def _prepare_generation_sample(self, sample: Dict[str, Any]) -> Dict[str, torch.Tensor]:
+    def _load_or_tokenize(self, cache_dir: Optional[str]) -> Dict[str, Any]:
         """
-        Prepare code generation sample.
+        Load tokenized samples from the disk cache, tokenizing on a miss.
+
+        The cache file is keyed by a hash of the samples, task, max_length,
+        label map and tokenizer, so any change produces a new entry.
 
         Args:
-            sample: Sample with 'code' and 'target' or 'description'
+            cache_dir: Cache directory (None disables caching)
 
         Returns:
-            Tokenized sample with input and target
+            Encodings as returned by _tokenize_samples()
         """
-        # Get input (description or prompt)
-        input_text = sample.get('description', sample.get('prompt', ''))
+        if cache_dir is None:
+            return self._tokenize_samples()
 
-        # Get target (code to generate)
-        target_text = sample.get('target', sample['code'])
+        cache_path = Path(cache_dir) / f"encodings_{self._cache_key()}.pt"
+        if cache_path.exists():
+            try:
+                encodings = torch.load(cache_path, weights_only=True)
+                logger.info(f"Loaded tokenized samples from cache: {cache_path}")
+                return encodings
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable tokenization cache {cache_path}: {e}")
 
-        # Tokenize input
-        input_encoding = self.tokenizer(
-            input_text,
-            max_length=self.max_length // 2,  # Use half for input
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
+        encodings = self._tokenize_samples()
 
-        # Tokenize target
-        target_encoding = self.tokenizer(
-            target_text,
-            max_length=self.max_length,
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            torch.save(encodings, tmp_path)
+            tmp_path.replace(cache_path)
+            logger.info(f"Cached tokenized samples to {cache_path}")
+        except OSError as e:
+            logger.warning(f"Could not write tokenization cache {cache_path}: {e}")
+
+        return encodings
+
+    def _cache_key(self) -> str:
+        """
+        Hash everything that determines the tokenized output.
+
+        Returns:
+            Hex digest identifying this dataset's encodings
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        header = {
+            'task': self.task.value,
+            'max_length': self.max_length,
+            'model_type': self.model_type.value if self.model_type else None,
+            'label_map': sorted((str(k), v) for k, v in (self.label_map or {}).items()),
+            'tokenizer': getattr(self.tokenizer, 'name_or_path', type(self.tokenizer).__name__),
+            'vocab_size': len(self.tokenizer)
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+        for sample in self.samples:
+            digest.update(json.dumps(sample, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _tokenize_samples(self, chunk_size: int = 1000) -> Dict[str, torch.Tensor]:
+        """
+        Tokenize all samples with batched tokenizer calls.
+
+        The fast tokenizer encodes each chunk of texts in a single call.
+        Sequences are truncated but not padded; padding happens per batch
+        in collate_fn.
+
+        Args:
+            chunk_size: Number of texts per tokenizer call
+
+        Returns:
+            Dictionary with per-sample input_ids and labels
+        """
+        if self.task == TaskType.CODE_GENERATION:
+            # Input is the description/prompt, target is the code to generate
+            input_texts = [s.get('description', s.get('prompt', '')) for s in self.samples]
+            target_texts = [s.get('target', s['code']) for s in self.samples]
+
+            # Use half of max_length for the input
+            input_ids = self._encode(input_texts, self.max_length // 2, chunk_size)
+
+            if self.model_type == ModelType.CAUSAL:
+                # Causal LM: one sequence prompt + target (+ EOS); labels are
+                # the same tokens with the prompt masked out of the loss
+                target_ids = self._encode(
+                    target_texts, self.max_length, chunk_size, add_special_tokens=False
+                )
+                input_ids, labels = self._pack_causal(input_ids, target_ids)
+            else:
+                # For seq2seq, labels are the target
+                labels = self._encode(target_texts, self.max_length, chunk_size)
+        else:
+            texts = [s['code'] for s in self.samples]
+            input_ids = self._encode(texts, self.max_length, chunk_size)
+            labels = torch.tensor(
+                [self.label_map.get(s['label'], 0) for s in self.samples],
+                dtype=torch.long
+            )
 
-        # For causal LM, labels are same as input_ids
-        # For seq2seq, labels are the target
         return {
-            'input_ids': input_encoding['input_ids'].squeeze(0),
-            'attention_mask': input_encoding['attention_mask'].squeeze(0),
-            'labels': target_encoding['input_ids'].squeeze(0)
+            'input_ids': input_ids,
+            'labels': labels
         }
 
+    def _pack_causal(
+        self,
+        prompt_ids: List[torch.Tensor],
+        target_ids: List[torch.Tensor]
+    ) -> Tuple[List[torch.Tensor], List[torch.Tensor]]:
+        """
+        Concatenate prompt and target tokens for causal LM training.
+
+        Over-long prompts are cut so the target keeps at least half of
+        max_length (or all of it, if shorter); a sample whose labels were
+        all -100 would give a NaN loss in a batch of such samples.
+
+        Args:
+            prompt_ids: Encoded prompts
+            target_ids: Encoded targets (without special tokens)
+
+        Returns:
+            Tuple of (input_ids, labels), with prompt positions in labels set to -100
+        """
+        eos_id = self.tokenizer.eos_token_id
+        eos = torch.tensor([eos_id], dtype=torch.long) if eos_id is not None else None
+
+        input_ids, labels = [], []
+        for prompt, target in zip(prompt_ids, target_ids):
+            tail = target if eos is None else torch.cat([target, eos])
+            prompt_budget = max(self.max_length - len(tail), self.max_length // 2)
+            prompt = prompt[:min(prompt_budget, self.max_length - 1)]
+
+            ids = torch.cat([prompt, tail])[:self.max_length]
+
+            label = ids.clone()
+            label[:len(prompt)] = -100
+
+            input_ids.append(ids)
+            labels.append(label)
+
+        return input_ids, labels
+
+    def _encode(
+        self,
+        texts: List[str],
+        max_length: int,
+        chunk_size: int,
+        add_special_tokens: bool = True
+    ) -> List[torch.Tensor]:
+        """
+        Encode texts to unpadded token tensors in chunks.
+
+        Args:
+            texts: Texts to encode
+            max_length: Truncation length
+            chunk_size: Number of texts per tokenizer call
+            add_special_tokens: Whether the tokenizer adds BOS/EOS/CLS tokens
+
+        Returns:
+            One 1D input_ids tensor per text
+        """
+        input_ids = []
+        for start in range(0, len(texts), chunk_size):
+            encoding = self.tokenizer(
+                texts[start:start + chunk_size],
+                max_length=max_length,
+                padding=False,
+                truncation=True,
+                add_special_tokens=add_special_tokens
+            )
+            input_ids.extend(
+                torch.tensor(ids, dtype=torch.long) for ids in encoding['input_ids']
+            )
+
+        return input_ids
+
 
 class DatasetLoader:
     """
     Dataset Loader for ML training.
 
-    Loads samples from JSON files and creates PyTorch datasets.
+    Loads samples from JSON or JSONL files and creates PyTorch datasets.
 
     Attributes:
-        data_path: Path to JSON file with samples
+        data_path: Path to JSON/JSONL file with samples
         tokenizer: HuggingFace tokenizer
         task: Task type
         max_length: Maximum sequence length
@@ -319,16 +548,21 @@ class DatasetLoader:
         data_path: str,
         tokenizer,
         task: str,
-        max_length: int = 512
+        max_length: int = 512,
+        cache_dir: Optional[str] = None,
+        model_type: Optional[str] = None
     ):
         """
         Initialize DatasetLoader.
 
         Args:
-            data_path: Path to JSON file with samples
+            data_path: Path to JSON file with samples, or a .jsonl file with
+                one sample per line
             tokenizer: HuggingFace tokenizer
             task: Task type (text_classification, code_generation, security_classification)
             max_length: Maximum sequence length
+            cache_dir: Optional directory for caching tokenized datasets
+            model_type: Model architecture, see CodeDataset (e.g. 'causal')
 
         Raises:
             DatasetError: If data file not found or invalid format
@@ -338,6 +572,8 @@ class DatasetLoader:
         self.tokenizer = tokenizer
         self.task = task
         self.max_length = max_length
+        self.cache_dir = cache_dir
+        self.model_type = model_type
 
         # Load samples
         self.samples = self._load_samples()
@@ -349,7 +585,10 @@ class DatasetLoader:
 
     def _load_samples(self) -> List[Dict[str, Any]]:
         """
-        Load samples from JSON file.
+        Load samples from JSON or JSONL file.
+
+        JSONL files are parsed line by line, so the raw text is never held
+        in memory as a whole. Uses orjson when installed.
 
         Returns:
             List of samples
@@ -363,9 +602,16 @@ class DatasetLoader:
                 details={'path': str(self.data_path)}
             )
 
+        loads = orjson.loads if orjson is not None else json.loads
+
         try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if self.data_path.suffix == '.jsonl':
+                data = self._load_jsonl(loads)
+            elif orjson is not None:
+                data = orjson.loads(self.data_path.read_bytes())
+            else:
+                with open(self.data_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
 
             # Handle different JSON structures
             if isinstance(data, list):
@@ -386,7 +632,10 @@ class DatasetLoader:
             logger.info(f"Loaded {len(samples)} samples from {self.data_path}")
             return samples
 
+        except DatasetError:
+            raise
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
             raise DatasetError(
                 f"Invalid JSON format: {e}",
                 details={'path': str(self.data_path)}
@@ -397,6 +646,33 @@ class DatasetLoader:
                 details={'path': str(self.data_path)}
             )
 
+    def _load_jsonl(self, loads) -> List[Dict[str, Any]]:
+        """
+        Stream samples from a JSONL file, one object per line.
+
+        Args:
+            loads: JSON decoding function (orjson.loads or json.loads)
+
+        Returns:
+            List of samples (blank lines are skipped)
+
+        Raises:
+            DatasetError: If a line is not valid JSON
+        """
+        samples = []
+        with open(self.data_path, 'rb') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    samples.append(loads(line))
+                except ValueError as e:
+                    raise DatasetError(
+                        f"Invalid JSON on line {line_number}: {e}",
+                        details={'path': str(self.data_path), 'line': line_number}
+                    )
+        return samples
+
     def get_full_dataset(self) -> CodeDataset:
         """
         Get full dataset without splitting.
@@ -412,7 +688,9 @@ class DatasetLoader:
             samples=self.samples,
             tokenizer=self.tokenizer,
             task=self.task,
-            max_length=self.max_length
+            max_length=self.max_length,
+            cache_dir=self.cache_dir,
+            model_type=self.model_type
         )
 
     def get_train_test_split(
@@ -444,37 +722,28 @@ class DatasetLoader:
                 f"test_size must be between 0.0 and 1.0, got {test_size}"
             )
 
-        # Shuffle samples if requested
-        samples = self.samples.copy()
+        # Tokenize once before splitting: the cache entry doesn't depend on
+        # the split, and both sides share one label map
+        full_dataset = self.get_full_dataset()
+
+        # Shuffle indices if requested
+        indices = list(range(len(self.samples)))
         if shuffle:
-            import random
-            random.seed(random_state)
-            random.shuffle(samples)
+            random.Random(random_state).shuffle(indices)
 
         # Split
-        split_idx = int(len(samples) * (1 - test_size))
-        train_samples = samples[:split_idx]
-        test_samples = samples[split_idx:]
+        split_idx = int(len(indices) * (1 - test_size))
+        train_indices = indices[:split_idx]
+        test_indices = indices[split_idx:]
 
         logger.info(
-            f"Split dataset: train={len(train_samples)}, test={len(test_samples)} "
+            f"Split dataset: train={len(train_indices)}, test={len(test_indices)} "
             f"(test_size={test_size})"
         )
 
         # Create datasets
-        train_dataset = CodeDataset(
-            samples=train_samples,
-            tokenizer=self.tokenizer,
-            task=self.task,
-            max_length=self.max_length
-        )
-
-        test_dataset = CodeDataset(
-            samples=test_samples,
-            tokenizer=self.tokenizer,
-            task=self.task,
-            max_length=self.max_length
-        )
+        train_dataset = full_dataset.subset(train_indices)
+        test_dataset = full_dataset.subset(test_indices)
 
         return train_dataset, test_dataset
 
@@ -36,14 +36,17 @@ Example:
 """
 
 import os
+import re
 import logging
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 from enum import Enum
 
 from domain.exceptions import ConfigurationError, TrainingError
 
 logger = logging.getLogger(__name__)
 
+__all__ = ['ModelManager', 'TaskType', 'ModelType', 'DEFAULT_MODELS']
+
 
 class TaskType(Enum):
     """Supported ML tasks."""
@@ -67,6 +70,63 @@ DEFAULT_MODELS = {
 }
 
 
+# Code generation prompt templates, placed around the user text
+_PYTHON_PATTERN = re.compile(r"python", re.IGNORECASE)
+_PYTHON_PROMPT_PREFIX = "# Python function\n# Input:"
+_TASK_PROMPT_PREFIX = "# Task:"
+_PROMPT_SUFFIX = "\n\ndef"
+
+
+_HF_CONFIGURED = False
+
+
+def _configure_huggingface_once() -> None:
+    """
+    Configure HuggingFace environment variables on first use.
+
+    Runs once per process, and only uses setdefault so values the caller
+    already exported (e.g. HF_HOME) are never overridden.
+    """
+    global _HF_CONFIGURED
+    if _HF_CONFIGURED:
+        return
+
+    # Set cache directory
+    hf_home = os.path.join(os.path.expanduser("~"), ".cache", "huggingface")
+    os.environ.setdefault('HF_HOME', hf_home)
+
+    # Disable symlinks warning (Windows compatibility)
+    os.environ.setdefault('HF_HUB_DISABLE_SYMLINKS_WARNING', "1")
+
+    # Increase download timeout
+    os.environ.setdefault('HF_HUB_DOWNLOAD_TIMEOUT', "500")
+
+    _HF_CONFIGURED = True
+    logger.debug("HuggingFace cache configured: %s", os.environ['HF_HOME'])
+
+
+def _from_pretrained_cache_first(auto_cls, model_name: str, **kwargs):
+    """
+    Load from the local HuggingFace cache, falling back to the Hub.
+
+    Avoids the Hub etag round-trips from_pretrained() makes for models
+    that are already fully cached.
+
+    Args:
+        auto_cls: HuggingFace Auto* class (model or tokenizer)
+        model_name: Local path or hub model ID
+        **kwargs: Extra from_pretrained() arguments
+
+    Returns:
+        Loaded model or tokenizer
+    """
+    try:
+        return auto_cls.from_pretrained(model_name, local_files_only=True, **kwargs)
+    except OSError:
+        logger.info(f"{model_name} not found in local cache, downloading from the Hub")
+        return auto_cls.from_pretrained(model_name, **kwargs)
+
+
 class ModelManager:
     """
     Model Manager for ML training infrastructure.
@@ -97,7 +157,8 @@ class ModelManager:
         model_name: Optional[str] = None,
         num_labels: Optional[int] = None,
         device: Optional[str] = None,
-        trust_remote_code: bool = True
+        trust_remote_code: bool = True,
+        torch_dtype: Optional[Any] = None
     ):
         """
         Initialize Model Manager.
@@ -108,6 +169,8 @@ class ModelManager:
             num_labels: Number of labels for classification (auto-detected if None)
             device: Device to use ('cpu', 'cuda', or None for auto-detect)
             trust_remote_code: Whether to trust remote code in models
+            torch_dtype: Optional dtype for model weights (e.g. torch.bfloat16).
+                Defaults to FP32, which mixed precision training expects.
 
         Raises:
             ConfigurationError: If task is unsupported or configuration invalid
@@ -152,9 +215,10 @@ class ModelManager:
             self.num_labels = None  # Not applicable for generation
 
         self.trust_remote_code = trust_remote_code
+        self.torch_dtype = torch_dtype
 
-        # Configure HuggingFace cache
-        self._configure_huggingface()
+        # Configure HuggingFace environment (once per process)
+        _configure_huggingface_once()
 
         # Initialize device
         self.device = self._initialize_device(device)
@@ -169,20 +233,6 @@ class ModelManager:
             f"model={self.model_name}, device={self.device}"
         )
 
-    def _configure_huggingface(self) -> None:
-        """Configure HuggingFace environment variables."""
-        # Set cache directory
-        hf_home = os.path.join(os.path.expanduser("~"), ".cache", "huggingface")
-        os.environ.setdefault('HF_HOME', hf_home)
-
-        # Disable symlinks warning (Windows compatibility)
-        os.environ.setdefault('HF_HUB_DISABLE_SYMLINKS_WARNING', "1")
-
-        # Increase download timeout
-        os.environ.setdefault('HF_HUB_DOWNLOAD_TIMEOUT', "500")
-
-        logger.debug(f"HuggingFace cache configured: {hf_home}")
-
     def _initialize_device(self, device: Optional[str] = None) -> str:
         """
         Initialize PyTorch device.
@@ -231,6 +281,7 @@ class ModelManager:
                 AutoModelForSequenceClassification,
                 AutoModelForCausalLM
             )
+            from transformers.utils import is_accelerate_available
             import torch
         except ImportError as e:
             raise TrainingError(
@@ -241,7 +292,14 @@ class ModelManager:
         try:
             # Load tokenizer
             logger.info(f"Loading tokenizer: {self.model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.tokenizer = _from_pretrained_cache_first(
+                AutoTokenizer, self.model_name, use_fast=True
+            )
+            if not self.tokenizer.is_fast:
+                logger.warning(
+                    f"No fast tokenizer available for {self.model_name}, "
+                    "batch tokenization will be slow"
+                )
 
             # Ensure tokenizer has pad token
             if self.tokenizer.pad_token is None:
@@ -250,38 +308,47 @@ class ModelManager:
 
             # Load model based on task
             logger.info(f"Loading model for task: {self.task.value}")
+            device_obj = torch.device(self.device)
+            load_kwargs = self._get_load_kwargs(device_obj, is_accelerate_available())
 
             if self.task == TaskType.CODE_GENERATION:
                 # Code generation uses causal LM
                 if "codegen" in self.model_name.lower():
-                    self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model = _from_pretrained_cache_first(
+                        AutoModelForCausalLM,
                         self.model_name,
                         trust_remote_code=self.trust_remote_code,
-                        pad_token_id=self.tokenizer.eos_token_id
+                        pad_token_id=self.tokenizer.eos_token_id,
+                        **load_kwargs
                     )
                 elif "bart" in self.model_name.lower():
                     # BART uses seq2seq
-                    self.model = AutoModelForSeq2SeqLM.from_pretrained(
-                        self.model_name
+                    self.model = _from_pretrained_cache_first(
+                        AutoModelForSeq2SeqLM,
+                        self.model_name,
+                        **load_kwargs
                     )
                 else:
                     # Generic causal LM
-                    self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model = _from_pretrained_cache_first(
+                        AutoModelForCausalLM,
                         self.model_name,
-                        trust_remote_code=self.trust_remote_code
+                        trust_remote_code=self.trust_remote_code,
+                        **load_kwargs
                     )
 
             elif self.task in [TaskType.TEXT_CLASSIFICATION, TaskType.SECURITY_CLASSIFICATION]:
                 # Classification tasks
-                self.model = AutoModelForSequenceClassification.from_pretrained(
+                self.model = _from_pretrained_cache_first(
+                    AutoModelForSequenceClassification,
                     self.model_name,
-                    num_labels=self.num_labels
+                    num_labels=self.num_labels,
+                    **load_kwargs
                 )
 
-            # Move model to device
-            import torch
-            device_obj = torch.device(self.device)
-            self.model.to(device_obj)
+            # Weights are already on the GPU when loaded with a device_map
+            if 'device_map' not in load_kwargs:
+                self.model.to(device_obj)
 
             logger.info(f"Model loaded and moved to {self.device}")
 
@@ -294,6 +361,36 @@ class ModelManager:
                 }
             )
 
+    def _get_load_kwargs(self, device, accelerate_available: bool) -> Dict[str, Any]:
+        """
+        Build extra from_pretrained() arguments for fast, low-memory loading.
+
+        With accelerate installed, weights are materialized directly from the
+        checkpoint (no random init followed by a copy), and on CUDA they are
+        loaded straight onto the target GPU instead of staging through host RAM.
+
+        Args:
+            device: Target torch.device
+            accelerate_available: Whether the accelerate package is installed
+
+        Returns:
+            Keyword arguments for from_pretrained()
+        """
+        load_kwargs: Dict[str, Any] = {}
+
+        if self.torch_dtype is not None:
+            load_kwargs['torch_dtype'] = self.torch_dtype
+
+        if accelerate_available:
+            load_kwargs['low_cpu_mem_usage'] = True
+            if device.type == 'cuda':
+                # Under torchrun each rank owns the GPU matching its LOCAL_RANK;
+                # current_device() is still 0 before the trainer sets it
+                index = device.index if device.index is not None else int(os.environ.get('LOCAL_RANK', 0))
+                load_kwargs['device_map'] = {'': index}
+
+        return load_kwargs
+
     def get_model(self):
         """
         Get loaded model.
@@ -402,10 +499,10 @@ class ModelManager:
             return text
 
         # Add code generation prompt template
-        if "python" in text.lower():
-            return f"# Python function\n# Input: {text}\n\ndef"
+        if _PYTHON_PATTERN.search(text):
+            return f"{_PYTHON_PROMPT_PREFIX} {text}{_PROMPT_SUFFIX}"
         else:
-            return f"# Task: {text}\n\ndef"
+            return f"{_TASK_PROMPT_PREFIX} {text}{_PROMPT_SUFFIX}"
 
     def get_num_parameters(self) -> int:
         """
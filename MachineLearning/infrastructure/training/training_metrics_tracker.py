@@ -8,6 +8,7 @@ This component provides:
 - Real-time metric collection (loss, accuracy, learning rate, etc.)
 - Metric history storage
 - Statistics calculation (mean, std, min, max)
+- Moving averages for smoothed curves
 - Progress tracking
 - Export to JSON/CSV for analysis
 
@@ -40,12 +41,14 @@ Example:
 
 import json
 import logging
+import math
 import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict
-import statistics
+from collections import defaultdict, deque
+
+import numpy as np
 
 from domain.exceptions import ConfigurationError
 
@@ -102,6 +105,43 @@ class MetricStatistics:
         return asdict(self)
 
 
+class _RunningStatistics:
+    """Incrementally maintained count/mean/std/min/max (Welford's algorithm)."""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = 0.0
+
+    def update(self, value: float) -> None:
+        """Add a value in O(1)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+
+    def to_statistics(self, name: str) -> MetricStatistics:
+        """Snapshot as MetricStatistics (sample std, like statistics.stdev)."""
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        return MetricStatistics(
+            name=name,
+            count=self.count,
+            mean=self.mean,
+            std=std,
+            min=self.min,
+            max=self.max,
+            last=self.last
+        )
+
+
 class TrainingMetricsTracker:
     """
     Training metrics tracker for real-time monitoring.
@@ -132,7 +172,8 @@ class TrainingMetricsTracker:
         output_dir: str = 'models/logs',
         experiment_name: str = 'experiment',
         auto_save: bool = True,
-        save_interval: int = 100
+        save_interval: int = 100,
+        max_history: Optional[int] = None
     ):
         """
         Initialize TrainingMetricsTracker.
@@ -140,8 +181,14 @@ class TrainingMetricsTracker:
         Args:
             output_dir: Directory for saving logs
             experiment_name: Name of experiment (used in filenames)
-            auto_save: Whether to auto-save periodically
+            auto_save: Whether to auto-save periodically. New entries are
+                appended to <experiment_name>_metrics.jsonl; the full JSON
+                snapshot is only written by save()
             save_interval: Save every N metric logs
+            max_history: Keep at most this many entries per metric in memory
+                (None = unbounded). Statistics and best values still cover
+                every logged value, and auto-saved entries stay in the
+                JSONL log.
 
         Raises:
             ConfigurationError: If output_dir cannot be created
@@ -150,6 +197,7 @@ class TrainingMetricsTracker:
         self.experiment_name = experiment_name
         self.auto_save = auto_save
         self.save_interval = save_interval
+        self.max_history = max_history
 
         # Create output directory
         try:
@@ -158,10 +206,26 @@ class TrainingMetricsTracker:
             raise ConfigurationError(f"Cannot create output directory: {e}")
 
         # Metric storage
-        self.metrics: Dict[str, List[MetricEntry]] = defaultdict(list)
+        # Bounded deques evict the oldest entry in O(1) once max_history is reached
+        self.metrics: Dict[str, "deque[MetricEntry]"] = defaultdict(
+            lambda: deque(maxlen=max_history)
+        )
         self.epoch_metrics: Dict[int, Dict[str, float]] = defaultdict(dict)
         self.best_metrics: Dict[str, Dict[str, Any]] = {}
 
+        # Lower-is-better flag per metric name, resolved once per name
+        self._is_loss: Dict[str, bool] = {}
+
+        # Running aggregates, so statistics and summaries don't rescan history
+        self._running_stats: Dict[str, _RunningStatistics] = defaultdict(_RunningStatistics)
+
+        # Entries not yet appended to the JSONL log
+        self._pending_entries: List[MetricEntry] = []
+
+        # Summary is rebuilt only after new metrics are logged
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self.jsonl_path = self.output_dir / f"{self.experiment_name}_metrics.jsonl"
+
         # State
         self.start_time = time.time()
         self.log_count = 0
@@ -200,14 +264,40 @@ class TrainingMetricsTracker:
         )
 
         self.metrics[name].append(entry)
+        self._running_stats[name].update(entry.value)
         self.log_count += 1
+        self._summary_cache = None
 
         # Update best metric
         self._update_best_metric(name, float(value), step)
 
         # Auto-save
-        if self.auto_save and self.log_count % self.save_interval == 0:
-            self.save()
+        if self.auto_save:
+            self._pending_entries.append(entry)
+            if self.log_count % self.save_interval == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Append entries logged since the last flush to the JSONL log.
+
+        Each auto-save writes only the new entries, one JSON object per
+        line, instead of rewriting the whole history.
+
+        Example:
+            >>> tracker.flush()
+        """
+        if not self._pending_entries:
+            return
+
+        lines = ''.join(
+            json.dumps(entry.to_dict()) + '\n' for entry in self._pending_entries
+        )
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+        logger.debug("Appended %d metric entries to %s", len(self._pending_entries), self.jsonl_path)
+        self._pending_entries.clear()
 
     def log_epoch_metric(
         self,
@@ -229,6 +319,7 @@ class TrainingMetricsTracker:
         """
         self.epoch_metrics[epoch][name] = float(value)
         self.current_epoch = epoch
+        self._summary_cache = None
 
         # Also log as regular metric
         self.log_metric(name, value, step=epoch, epoch=epoch)
@@ -266,24 +357,25 @@ class TrainingMetricsTracker:
             value: Metric value
             step: Global step
         """
-        # Determine if lower or higher is better
-        # Convention: metrics with 'loss' or 'error' in name -> lower is better
-        is_loss = 'loss' in name.lower() or 'error' in name.lower()
-
-        if name not in self.best_metrics:
+        best = self.best_metrics.get(name)
+
+        if best is None:
+            # Determine if lower or higher is better
+            # Convention: metrics with 'loss' or 'error' in name -> lower is better
+            lowered = name.lower()
+            is_loss = 'loss' in lowered or 'error' in lowered
+            self._is_loss[name] = is_loss
             self.best_metrics[name] = {
                 'value': value,
                 'step': step,
                 'is_loss': is_loss
             }
-        else:
-            current_best = self.best_metrics[name]['value']
-            if (is_loss and value < current_best) or (not is_loss and value > current_best):
-                self.best_metrics[name] = {
-                    'value': value,
-                    'step': step,
-                    'is_loss': is_loss
-                }
+            return
+
+        current_best = best['value']
+        if value < current_best if self._is_loss[name] else value > current_best:
+            best['value'] = value
+            best['step'] = step
 
     def get_metric_history(self, name: str) -> List[MetricEntry]:
         """
@@ -293,19 +385,22 @@ class TrainingMetricsTracker:
             name: Metric name
 
         Returns:
-            List of metric entries
+            List of metric entries (the most recent max_history entries)
 
         Example:
             >>> history = tracker.get_metric_history('train_loss')
             >>> for entry in history:
             ...     print(f"Step {entry.step}: {entry.value}")
         """
-        return self.metrics.get(name, [])
+        return list(self.metrics.get(name, ()))
 
     def get_metric_statistics(self, name: str) -> Optional[MetricStatistics]:
         """
         Get statistics for a specific metric.
 
+        Served from running aggregates updated on every log, so the cost
+        doesn't grow with the history length.
+
         Args:
             name: Metric name
 
@@ -316,21 +411,51 @@ class TrainingMetricsTracker:
             >>> stats = tracker.get_metric_statistics('train_loss')
             >>> print(f"Mean: {stats.mean:.4f}, Std: {stats.std:.4f}")
         """
-        history = self.get_metric_history(name)
-        if not history:
+        running = self._running_stats.get(name)
+        if running is None or running.count == 0:
             return None
 
-        values = [entry.value for entry in history]
+        return running.to_statistics(name)
 
-        return MetricStatistics(
-            name=name,
-            count=len(values),
-            mean=statistics.mean(values),
-            std=statistics.stdev(values) if len(values) > 1 else 0.0,
-            min=min(values),
-            max=max(values),
-            last=values[-1]
+    def get_moving_average(self, name: str, window: int = 10) -> List[float]:
+        """
+        Get the trailing moving average of a metric.
+
+        Computed in one vectorized pass from a prefix sum, so the cost is
+        O(n) regardless of the window size. The first window - 1 points
+        average over the values seen so far.
+
+        Args:
+            name: Metric name
+            window: Number of values per average
+
+        Returns:
+            Smoothed values, one per logged entry (empty if metric not found)
+
+        Raises:
+            ConfigurationError: If window is smaller than 1
+
+        Example:
+            >>> smoothed = tracker.get_moving_average('train_loss', window=50)
+        """
+        if window < 1:
+            raise ConfigurationError(f"window must be >= 1, got {window}")
+
+        history = self.metrics.get(name)
+        if not history:
+            return []
+
+        values = np.fromiter(
+            (entry.value for entry in history), dtype=np.float64, count=len(history)
         )
+        cumsum = np.concatenate(([0.0], np.cumsum(values)))
+
+        idx = np.arange(len(values))
+        start = np.maximum(0, idx - window + 1)
+        sums = cumsum[idx + 1] - cumsum[start]
+        counts = idx + 1 - start
+
+        return (sums / counts).tolist()
 
     def get_all_statistics(self) -> Dict[str, MetricStatistics]:
         """
@@ -360,7 +485,8 @@ class TrainingMetricsTracker:
             >>> best = tracker.get_best_metrics()
             >>> print(f"Best eval loss: {best['eval_loss']['value']:.4f}")
         """
-        return self.best_metrics.copy()
+        # Best entries are updated in place, so hand out copies
+        return {name: dict(info) for name, info in self.best_metrics.items()}
 
     def get_epoch_metrics(self, epoch: int) -> Dict[str, float]:
         """
@@ -382,6 +508,9 @@ class TrainingMetricsTracker:
         """
         Get training summary with key metrics.
 
+        The aggregated part is cached until the next log call; only
+        elapsed_time is refreshed on every call.
+
         Returns:
             Summary dictionary
 
@@ -389,28 +518,33 @@ class TrainingMetricsTracker:
             >>> summary = tracker.get_summary()
             >>> print(json.dumps(summary, indent=2))
         """
-        elapsed_time = time.time() - self.start_time
-
-        summary = {
-            'experiment_name': self.experiment_name,
-            'start_time': self.start_time,
-            'elapsed_time': elapsed_time,
-            'total_logs': self.log_count,
-            'current_epoch': self.current_epoch,
-            'num_metrics': len(self.metrics),
-            'metric_names': list(self.metrics.keys()),
-            'best_metrics': self.best_metrics,
-            'statistics': {
-                name: stats.to_dict()
-                for name, stats in self.get_all_statistics().items()
+        if self._summary_cache is None:
+            self._summary_cache = {
+                'experiment_name': self.experiment_name,
+                'start_time': self.start_time,
+                'elapsed_time': 0.0,
+                'total_logs': self.log_count,
+                'current_epoch': self.current_epoch,
+                'num_metrics': len(self.metrics),
+                'metric_names': list(self.metrics.keys()),
+                'best_metrics': self.get_best_metrics(),
+                'statistics': {
+                    name: stats.to_dict()
+                    for name, stats in self.get_all_statistics().items()
+                }
             }
-        }
+
+        summary = dict(self._summary_cache)
+        summary['elapsed_time'] = time.time() - self.start_time
 
         return summary
 
     def save(self, filename: Optional[str] = None) -> None:
         """
-        Save metrics to JSON file.
+        Save a full metrics snapshot to a JSON file.
+
+        Also flushes pending entries to the JSONL log. Meant for the end of
+        training or explicit checkpoints; periodic auto-saves use flush().
 
         Args:
             filename: Optional custom filename (default: <experiment_name>_metrics.json)
@@ -419,6 +553,9 @@ class TrainingMetricsTracker:
             >>> tracker.save()  # Uses default filename
             >>> tracker.save('custom_metrics.json')
         """
+        if self.auto_save:
+            self.flush()
+
         if filename is None:
             filename = f"{self.experiment_name}_metrics.json"
 
@@ -469,30 +606,26 @@ class TrainingMetricsTracker:
             >>> tracker.export_to_csv('metrics.csv')
         """
         import csv
+        from operator import itemgetter
 
         filepath = self.output_dir / filename
 
-        # Collect all entries
-        all_entries = []
-        for name, entries in self.metrics.items():
-            for entry in entries:
-                all_entries.append({
-                    'metric_name': entry.name,
-                    'value': entry.value,
-                    'step': entry.step,
-                    'epoch': entry.epoch,
-                    'timestamp': entry.timestamp
-                })
+        # Collect all entries as plain tuples in one pass (no per-row dicts)
+        all_entries = [
+            (entry.name, entry.value, entry.step, entry.epoch, entry.timestamp)
+            for entries in self.metrics.values()
+            for entry in entries
+        ]
 
         # Sort by step
-        all_entries.sort(key=lambda x: x['step'])
+        all_entries.sort(key=itemgetter(2))
 
         # Write CSV
         if all_entries:
             fieldnames = ['metric_name', 'value', 'step', 'epoch', 'timestamp']
             with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
                 writer.writerows(all_entries)
 
             logger.info(f"Exported metrics to {filepath}")
@@ -507,6 +640,10 @@ class TrainingMetricsTracker:
         self.metrics.clear()
         self.epoch_metrics.clear()
         self.best_metrics.clear()
+        self._is_loss.clear()
+        self._running_stats.clear()
+        self._pending_entries.clear()
+        self._summary_cache = None
         self.log_count = 0
         self.start_time = time.time()
 
@@ -0,0 +1,11 @@
+"""
+Compatibility Helpers
+=====================
+
+Settings that depend on the running Python version.
+"""
+
+import sys
+
+# Keyword arguments for @dataclass: __slots__ dataclasses require Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -9,19 +9,143 @@ Comprehensive validation for trained models:
 - Output quality assessment
 """
 
+import numpy as np
 import torch
+import functools
+import gc
 import json
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import time
 
+from infrastructure.utils.compat import DATACLASS_SLOTS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _cpu_supports_bf16() -> bool:
+    """Check for native BF16 matmul support on the CPU (AVX512-BF16 or AMX)."""
+    for name in ('_is_avx512_bf16_supported', '_is_amx_tile_supported'):
+        check = getattr(torch.cpu, name, None)
+        try:
+            if check is not None and check():
+                return True
+        except Exception:
+            pass
+    return False
+
+
+def _select_dtype_name() -> str:
+    """Pick the weight dtype for validation: FP16 on GPU, BF16 on capable CPUs."""
+    if torch.cuda.is_available():
+        return 'float16'
+    return 'bfloat16' if _cpu_supports_bf16() else 'float32'
+
+
+def _preload_transformers():
+    """Import the transformers classes used by the validator."""
+    try:
+        from transformers import AutoConfig, AutoModelForCausalLM, AutoTokenizer  # noqa: F401
+    except ImportError:
+        # Reported by the load checks
+        pass
+
+
+def _select_device_map() -> Optional[str]:
+    """
+    Pick the device_map for loading.
+
+    A single GPU gets an explicit 'cuda:0', which skips accelerate's
+    sharding planner; 'auto' is only used when there is something to shard.
+    """
+    if not torch.cuda.is_available():
+        return None
+    return 'cuda:0' if torch.cuda.device_count() == 1 else 'auto'
+
+
+def _file_signature(path: Path, names: Set[str]) -> Tuple[Tuple[str, int, int], ...]:
+    """(name, st_mtime_ns, st_size) of each existing file, for cache keys."""
+    signature = []
+    for name in sorted(names):
+        try:
+            stat = os.stat(path / name)
+        except OSError:
+            continue
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_model_cached(
+    model_path: str,
+    dtype_name: str,
+    device_map: Optional[str],
+    use_safetensors: Optional[bool] = None,
+    weights_signature: Tuple[Tuple[str, int, int], ...] = (),
+    compiled: bool = False
+):
+    """
+    Load config and model once per (path, dtype, device_map) in this process.
+
+    Repeated validations of the same checkpoint (batch validation, A/B
+    comparisons, CI matrices) reuse the loaded weights instead of reading
+    them from disk again. weights_signature and compiled only extend the
+    cache key: a checkpoint rewritten in place is loaded again, and a model
+    whose forward a validator compiles is never handed to one that runs eager.
+
+    Returns:
+        Tuple of (model, config, config_load_time, model_load_time)
+    """
+    from transformers import AutoModelForCausalLM, AutoConfig
+
+    start_time = time.time()
+    config = AutoConfig.from_pretrained(model_path)
+    config_load_time = time.time() - start_time
+
+    model_start = time.time()
+    model = AutoModelForCausalLM.from_pretrained(
+        model_path,
+        torch_dtype=getattr(torch, dtype_name),
+        device_map=device_map,
+        use_safetensors=use_safetensors,
+        # Stream weights into the final tensors instead of materializing
+        # a randomly initialized copy first
+        low_cpu_mem_usage=True
+    )
+    model_load_time = time.time() - model_start
+
+    return model, config, config_load_time, model_load_time
+
+
+@functools.lru_cache(maxsize=4)
+def _load_tokenizer_cached(
+    tokenizer_path: str,
+    files_signature: Tuple[Tuple[str, int, int], ...] = ()
+):
+    """
+    Load a tokenizer once per path (and tokenizer file versions) in this process.
+
+    Returns:
+        Tuple of (tokenizer, load_time)
+    """
+    from transformers import AutoTokenizer
+
+    start_time = time.time()
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+    return tokenizer, time.time() - start_time
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ValidationResult:
     """Result of model validation."""
 
@@ -65,25 +189,54 @@ class ValidationResult:
         }
 
     def save(self, output_path: str):
-        """Save validation result to JSON file."""
-        with open(output_path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """Save validation result to JSON file (uses orjson when installed)."""
+        if orjson is not None:
+            # orjson serializes the dataclass directly, no to_dict() copy
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    self, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
         logger.info(f"[SAVE] Validation result saved to {output_path}")
 
 
 class ModelValidator:
     """Validator for trained models."""
 
-    def __init__(self, model_path: str, tokenizer_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_path: Optional[str] = None,
+        compile_model: bool = False,
+        max_generation_time: Optional[float] = 10.0,
+        use_cache: bool = False
+    ):
         """
         Initialize model validator.
 
         Args:
             model_path: Path to model directory or file
             tokenizer_path: Path to tokenizer (optional, defaults to model_path)
+            compile_model: Compile the model forward with torch.compile on GPU
+                so inference checks and benchmarks measure deployed latency
+                (compilation adds a one-off warmup to model loading)
+            max_generation_time: Time limit in seconds for each generate() call
+                in the inference and quality checks (None = no limit)
+            use_cache: Keep the loaded model and tokenizer in a process-wide
+                cache for later validators (release with clear_cache())
         """
         self.model_path = Path(model_path)
         self.tokenizer_path = Path(tokenizer_path) if tokenizer_path else self.model_path
+        self.compile_model = compile_model
+        self.max_generation_time = max_generation_time
+        self.use_cache = use_cache
+        self.compiled = False
+
+        # Importing transformers takes seconds; overlap it with the file checks
+        self._preload_thread = threading.Thread(target=_preload_transformers, daemon=True)
+        self._preload_thread.start()
 
         self.result = ValidationResult(
             model_path=str(self.model_path),
@@ -105,6 +258,7 @@ class ModelValidator:
 
         # Essential checks (always run)
         self.check_files_exist()
+        self._preload_thread.join()
         self.check_model_loadable()
         self.check_tokenizer_loadable()
 
@@ -123,47 +277,39 @@ class ModelValidator:
         """Check that all required files exist."""
         logger.info("[CHECK] Checking file existence...")
 
-        required_files = []
         found_files = []
         missing_files = []
 
+        # One directory listing per path instead of a stat per candidate file
+        model_entries = self._list_dir(self.model_path)
+        self._model_entries = model_entries
+        if self.tokenizer_path != self.model_path:
+            tokenizer_entries = self._list_dir(self.tokenizer_path)
+        else:
+            tokenizer_entries = model_entries
+
         # Model files
-        model_files = [
-            'pytorch_model.bin',
-            'model.safetensors',
-            'config.json'
-        ]
-
-        for filename in model_files:
-            filepath = self.model_path / filename
-            if filepath.exists():
-                found_files.append(filename)
-                break
+        model_files = model_entries & {'pytorch_model.bin', 'model.safetensors'}
+        if model_files:
+            found_files.extend(sorted(model_files))
         else:
             missing_files.append("model file (pytorch_model.bin or model.safetensors)")
 
         # Config file
-        config_file = self.model_path / 'config.json'
-        if config_file.exists():
+        if 'config.json' in model_entries:
             found_files.append('config.json')
         else:
             missing_files.append('config.json')
 
         # Tokenizer files
-        tokenizer_files = [
+        tokenizer_files = tokenizer_entries & {
             'tokenizer.json',
             'tokenizer_config.json',
             'vocab.json'
-        ]
-
-        tokenizer_found = False
-        for filename in tokenizer_files:
-            filepath = self.tokenizer_path / filename
-            if filepath.exists():
-                found_files.append(filename)
-                tokenizer_found = True
+        }
+        found_files.extend(sorted(tokenizer_files))
 
-        if not tokenizer_found:
+        if not tokenizer_files:
             self.result.add_warning("No tokenizer files found")
 
         # Record check result
@@ -181,27 +327,40 @@ class ModelValidator:
         else:
             logger.error(f"  [FAIL] Missing files: {', '.join(missing_files)}")
 
+    @staticmethod
+    def _list_dir(path: Path) -> Set[str]:
+        """List entry names of a directory (empty set if it can't be read)."""
+        try:
+            with os.scandir(path) as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
+
     def check_model_loadable(self):
         """Check that model can be loaded."""
         logger.info("[CHECK] Checking model loading...")
 
         try:
-            from transformers import AutoModelForCausalLM, AutoConfig
-
-            start_time = time.time()
-
-            # Load config first
-            config = AutoConfig.from_pretrained(str(self.model_path))
-            config_load_time = time.time() - start_time
-
-            # Load model
-            model_start = time.time()
-            model = AutoModelForCausalLM.from_pretrained(
-                str(self.model_path),
-                torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-                device_map='auto' if torch.cuda.is_available() else None
+            hits = _load_model_cached.cache_info().hits
+
+            # Prefer mmap-backed safetensors over unpickling pytorch_model.bin
+            entries = getattr(self, '_model_entries', None) or self._list_dir(self.model_path)
+            use_safetensors = True if 'model.safetensors' in entries else None
+
+            # Load config and model (memoized per process only when requested)
+            load_fn = _load_model_cached if self.use_cache else _load_model_cached.__wrapped__
+            model, config, config_load_time, model_load_time = load_fn(
+                str(self.model_path.resolve()),
+                _select_dtype_name(),
+                _select_device_map(),
+                use_safetensors,
+                _file_signature(self.model_path, entries & {'pytorch_model.bin', 'model.safetensors'}),
+                self.compile_model
             )
-            model_load_time = time.time() - model_start
+
+            cache_hit = self.use_cache and _load_model_cached.cache_info().hits > hits
+            if cache_hit:
+                config_load_time = model_load_time = 0.0
 
             # Get model info
             param_count = sum(p.numel() for p in model.parameters())
@@ -213,7 +372,10 @@ class ModelValidator:
                 'total_parameters': param_count,
                 'trainable_parameters': trainable_params,
                 'model_type': config.model_type,
-                'architecture': model.__class__.__name__
+                'architecture': model.__class__.__name__,
+                'dtype': str(model.dtype),
+                'load_strategy': 'safetensors' if use_safetensors else 'auto',
+                'cache_hit': cache_hit
             })
 
             self.result.metrics['model_load_time'] = model_load_time
@@ -227,22 +389,74 @@ class ModelValidator:
             self.model = model
             self.config = config
 
+            if self.compile_model:
+                self._compile()
+
         except Exception as e:
             error_msg = f"Failed to load model: {str(e)}"
             self.result.add_check('model_loadable', False, {'error': error_msg})
             self.result.add_error(error_msg)
             logger.error(f"  [FAIL] {error_msg}")
 
+    def _compile(self):
+        """
+        Compile the model forward with torch.compile (GPU only).
+
+        Only forward is compiled, so generate() keeps its Python loop and
+        graph breaks there are tolerated. A cached model is only shared with
+        other compiling validators (compile_model is part of the cache key),
+        so it is compiled at most once.
+
+        mode='default' rather than 'reduce-overhead': the checks run a growing
+        dynamic KV cache, which would re-record CUDA graphs on every new shape.
+        A short untimed generate() follows, so compilation is not charged to
+        the first timed check or cut off by its max_time limit.
+        """
+        if not hasattr(torch, 'compile') or not torch.cuda.is_available():
+            return
+
+        if getattr(self.model, '_validator_compiled', False):
+            self.compiled = True
+            return
+
+        try:
+            self.model.forward = torch.compile(
+                self.model.forward, mode="default", fullgraph=False
+            )
+            self.model._validator_compiled = True
+            self.compiled = True
+
+            # Warm up both the prefill and the single-token decode graphs
+            warmup_ids = torch.ones((1, 8), dtype=torch.long, device=self.model.device)
+            with torch.inference_mode():
+                self.model.generate(
+                    input_ids=warmup_ids,
+                    attention_mask=torch.ones_like(warmup_ids),
+                    max_new_tokens=2,
+                    do_sample=False,
+                    use_cache=True,
+                    pad_token_id=1
+                )
+            logger.info("       Model forward compiled (mode=default)")
+        except Exception as e:
+            logger.warning(f"  [WARN] torch.compile failed, using eager mode: {e}")
+
     def check_tokenizer_loadable(self):
         """Check that tokenizer can be loaded."""
         logger.info("[CHECK] Checking tokenizer loading...")
 
         try:
-            from transformers import AutoTokenizer
-
-            start_time = time.time()
-            tokenizer = AutoTokenizer.from_pretrained(str(self.tokenizer_path))
-            load_time = time.time() - start_time
+            hits = _load_tokenizer_cached.cache_info().hits
+            load_fn = _load_tokenizer_cached if self.use_cache else _load_tokenizer_cached.__wrapped__
+            tokenizer, load_time = load_fn(
+                str(self.tokenizer_path.resolve()),
+                _file_signature(self.tokenizer_path, self._list_dir(self.tokenizer_path) & {
+                    'tokenizer.json', 'tokenizer_config.json', 'vocab.json'
+                })
+            )
+            cache_hit = self.use_cache and _load_tokenizer_cached.cache_info().hits > hits
+            if cache_hit:
+                load_time = 0.0
 
             vocab_size = tokenizer.vocab_size
             special_tokens = tokenizer.special_tokens_map
@@ -250,7 +464,8 @@ class ModelValidator:
             self.result.add_check('tokenizer_loadable', True, {
                 'load_time': f"{load_time:.2f}s",
                 'vocab_size': vocab_size,
-                'special_tokens': list(special_tokens.keys())
+                'special_tokens': list(special_tokens.keys()),
+                'cache_hit': cache_hit
             })
 
             logger.info(f"  [OK] Tokenizer loaded successfully")
@@ -260,6 +475,13 @@ class ModelValidator:
             # Store tokenizer for further checks
             self.tokenizer = tokenizer
 
+            # Batched generation pads on the left; resolve the pad id once
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            tokenizer.padding_side = 'left'
+            self._pad_id = tokenizer.pad_token_id
+            self._eos_id = tokenizer.eos_token_id
+
         except Exception as e:
             error_msg = f"Failed to load tokenizer: {str(e)}"
             self.result.add_check('tokenizer_loadable', False, {'error': error_msg})
@@ -330,42 +552,40 @@ class ModelValidator:
             ]
 
         try:
-            results = []
-
-            for prompt in test_prompts:
-                start_time = time.time()
+            start_time = time.time()
 
-                # Tokenize
-                inputs = self.tokenizer(prompt, return_tensors="pt")
-                if torch.cuda.is_available():
-                    inputs = {k: v.cuda() for k, v in inputs.items()}
+            # Tokenize, generate and decode all prompts as one batch
+            inputs = self._encode_batch(test_prompts)
 
-                # Generate
-                with torch.no_grad():
-                    outputs = self.model.generate(
-                        **inputs,
-                        max_new_tokens=20,
-                        do_sample=False,
-                        pad_token_id=self.tokenizer.eos_token_id
-                    )
+            with torch.inference_mode():
+                outputs = self.model.generate(
+                    **inputs,
+                    max_new_tokens=20,
+                    do_sample=False,
+                    use_cache=True,
+                    pad_token_id=self._pad_id,
+                    **self._stopping_kwargs()
+                )
 
-                # Decode
-                generated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            generated = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
-                inference_time = time.time() - start_time
+            # Per-prompt time is the batch time split evenly
+            avg_time = (time.time() - start_time) / len(test_prompts)
 
-                results.append({
+            results = [
+                {
                     'prompt': prompt[:50],
-                    'output': generated[:100],
-                    'time': f"{inference_time:.3f}s"
-                })
+                    'output': output[:100],
+                    'time': f"{avg_time:.3f}s"
+                }
+                for prompt, output in zip(test_prompts, generated)
+            ]
 
             self.result.add_check('inference', True, {
                 'test_count': len(test_prompts),
                 'results': results
             })
 
-            avg_time = sum(float(r['time'].replace('s', '')) for r in results) / len(results)
             self.result.metrics['avg_inference_time'] = avg_time
 
             logger.info(f"  [OK] Inference working")
@@ -378,8 +598,42 @@ class ModelValidator:
             self.result.add_error(error_msg)
             logger.error(f"  [FAIL] {error_msg}")
 
+    def _stopping_kwargs(self) -> Dict[str, Any]:
+        """
+        generate() arguments that end a check's generation early.
+
+        Sequences stop at the tokenizer's EOS (some checkpoints carry no
+        eos_token_id in their generation config) and the whole call is
+        capped at max_generation_time seconds. The benchmark doesn't use
+        these, since it measures a fixed number of new tokens.
+        """
+        kwargs = {}
+        if self._eos_id is not None:
+            kwargs['eos_token_id'] = self._eos_id
+        if self.max_generation_time:
+            kwargs['max_time'] = self.max_generation_time
+        return kwargs
+
+    def _encode_batch(self, prompts: List[str]) -> Dict[str, torch.Tensor]:
+        """
+        Tokenize prompts as one padded batch on the inference device.
+
+        The tokenizer is set up for left padding in check_tokenizer_loadable,
+        since decoder-only models continue from the last position.
+        """
+        inputs = self.tokenizer(prompts, padding=True, truncation=True, return_tensors="pt")
+        if torch.cuda.is_available():
+            inputs = {k: v.cuda() for k, v in inputs.items()}
+        return inputs
+
     def benchmark_inference_speed(self, num_samples: int = 10):
-        """Benchmark inference speed."""
+        """
+        Benchmark inference speed.
+
+        All samples run as one batched generate() call, timed with CUDA
+        events on GPU. avg_time is the batch time divided by num_samples,
+        so tokens_per_second is the aggregate batched throughput.
+        """
         logger.info(f"[CHECK] Benchmarking inference speed ({num_samples} samples)...")
 
         if not hasattr(self, 'model') or not hasattr(self, 'tokenizer'):
@@ -388,44 +642,65 @@ class ModelValidator:
 
         try:
             test_prompt = "def calculate_sum(numbers):"
-            times = []
-
-            for _ in range(num_samples):
-                start = time.time()
-
-                inputs = self.tokenizer(test_prompt, return_tensors="pt")
-                if torch.cuda.is_available():
-                    inputs = {k: v.cuda() for k, v in inputs.items()}
-
-                with torch.no_grad():
-                    _ = self.model.generate(
+            max_new_tokens = 50
+
+            # Identical prompts, so the batch needs no padding
+            inputs = self.tokenizer([test_prompt] * num_samples, return_tensors="pt")
+            if torch.cuda.is_available():
+                inputs = {k: v.cuda() for k, v in inputs.items()}
+
+            # A fixed-shape KV buffer lets the compiled forward be reused
+            # across decode steps without recompiling
+            cache_kwargs = {}
+            if getattr(self.model, '_supports_static_cache', False):
+                cache_kwargs['cache_implementation'] = 'static'
+
+            def run():
+                with torch.inference_mode():
+                    self.model.generate(
                         **inputs,
-                        max_new_tokens=50,
+                        max_new_tokens=max_new_tokens,
                         do_sample=False,
-                        pad_token_id=self.tokenizer.eos_token_id
+                        use_cache=True,
+                        pad_token_id=self._pad_id,
+                        **cache_kwargs
                     )
 
-                times.append(time.time() - start)
+            # Untimed warmup so compilation and CUDA init aren't measured
+            run()
+
+            if torch.cuda.is_available():
+                start_event = torch.cuda.Event(enable_timing=True)
+                end_event = torch.cuda.Event(enable_timing=True)
+                start_event.record()
+                run()
+                end_event.record()
+                torch.cuda.synchronize()
+                batch_time = start_event.elapsed_time(end_event) / 1000
+            else:
+                start = time.perf_counter()
+                run()
+                batch_time = time.perf_counter() - start
 
-            avg_time = sum(times) / len(times)
-            min_time = min(times)
-            max_time = max(times)
+            avg_time = batch_time / num_samples
+            tokens_per_second = max_new_tokens / avg_time
 
             self.result.add_check('benchmark', True, {
                 'samples': num_samples,
+                'batch_time': f"{batch_time:.3f}s",
                 'avg_time': f"{avg_time:.3f}s",
-                'min_time': f"{min_time:.3f}s",
-                'max_time': f"{max_time:.3f}s",
-                'tokens_per_second': f"{50 / avg_time:.1f}"
+                'tokens_per_second': f"{tokens_per_second:.1f}",
+                'compiled': self.compiled,
+                'kv_cache': True,
+                'static_cache': bool(cache_kwargs)
             })
 
             self.result.metrics['benchmark_avg_time'] = avg_time
-            self.result.metrics['tokens_per_second'] = 50 / avg_time
+            self.result.metrics['tokens_per_second'] = tokens_per_second
 
             logger.info(f"  [OK] Benchmark complete")
-            logger.info(f"       Avg: {avg_time:.3f}s")
-            logger.info(f"       Min: {min_time:.3f}s, Max: {max_time:.3f}s")
-            logger.info(f"       ~{50 / avg_time:.1f} tokens/sec")
+            logger.info(f"       Batch: {batch_time:.3f}s, Avg: {avg_time:.3f}s")
+            logger.info(f"       ~{tokens_per_second:.1f} tokens/sec")
 
         except Exception as e:
             error_msg = f"Benchmark failed: {str(e)}"
@@ -449,29 +724,36 @@ class ModelValidator:
                 ("public class Hello {", "java")
             ]
 
-            quality_scores = []
+            # Generate all test cases as one batch
+            inputs = self._encode_batch([prompt for prompt, _ in test_cases])
 
-            for prompt, language in test_cases:
-                inputs = self.tokenizer(prompt, return_tensors="pt")
-                if torch.cuda.is_available():
-                    inputs = {k: v.cuda() for k, v in inputs.items()}
+            with torch.inference_mode():
+                outputs = self.model.generate(
+                    **inputs,
+                    max_new_tokens=50,
+                    do_sample=True,
+                    temperature=0.7,
+                    top_p=0.9,
+                    use_cache=True,
+                    pad_token_id=self._pad_id,
+                    **self._stopping_kwargs()
+                )
 
-                with torch.no_grad():
-                    outputs = self.model.generate(
-                        **inputs,
-                        max_new_tokens=50,
-                        do_sample=True,
-                        temperature=0.7,
-                        top_p=0.9,
-                        pad_token_id=self.tokenizer.eos_token_id
-                    )
+            generated_texts = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
-                generated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            # Token-level metrics work on the ids directly, without padding
+            token_rows = outputs.cpu().numpy()
+            bracket_ids = self._bracket_token_ids()
+
+            quality_scores = []
+
+            for generated, row in zip(generated_texts, token_rows):
+                token_ids = row[row != self._pad_id]
 
                 # Basic quality metrics
-                has_code = any(char in generated for char in '(){}[]')
+                has_code = bool(np.isin(token_ids, bracket_ids).any())
                 reasonable_length = 10 < len(generated) < 500
-                not_repetitive = len(set(generated.split())) / max(len(generated.split()), 1) > 0.3
+                not_repetitive = bool(np.unique(token_ids).size / max(token_ids.size, 1) > 0.3)
 
                 score = sum([has_code, reasonable_length, not_repetitive]) / 3
                 quality_scores.append(score)
@@ -495,6 +777,33 @@ class ModelValidator:
             self.result.add_warning(error_msg)
             logger.warning(f"  [WARN] {error_msg}")
 
+    def _bracket_token_ids(self) -> np.ndarray:
+        """IDs of vocabulary tokens containing a bracket (computed once per validator)."""
+        if getattr(self, '_bracket_ids', None) is None:
+            self._bracket_ids = np.fromiter(
+                (
+                    token_id for token, token_id in self.tokenizer.get_vocab().items()
+                    if any(char in token for char in '(){}[]')
+                ),
+                dtype=np.int64
+            )
+        return self._bracket_ids
+
+    @staticmethod
+    def clear_cache():
+        """
+        Drop the process-wide model and tokenizer caches.
+
+        Validators that still reference a model keep it alive until they
+        are released.
+        """
+        _load_model_cached.cache_clear()
+        _load_tokenizer_cached.cache_clear()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info("[*] Model validation cache cleared")
+
     def get_result(self) -> ValidationResult:
         """Get validation result."""
         return self.result
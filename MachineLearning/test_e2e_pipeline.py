@@ -307,11 +307,11 @@ class E2ETestRunner:
             def tokenize_function(examples):
                 # Combine input and output for language modeling
                 texts = [f"{inp}\n{out}" for inp, out in zip(examples['input'], examples['output'])]
+                # Padding happens per batch in the data collator
                 return tokenizer(
                     texts,
                     truncation=True,
-                    max_length=128,
-                    padding='max_length'
+                    max_length=128
                 )
 
             train_dataset = train_dataset.map(
@@ -350,7 +350,8 @@ class E2ETestRunner:
             # Data collator
             data_collator = DataCollatorForLanguageModeling(
                 tokenizer=tokenizer,
-                mlm=False
+                mlm=False,
+                pad_to_multiple_of=8
             )
 
             # Create trainer
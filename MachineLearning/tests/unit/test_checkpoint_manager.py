@@ -0,0 +1,113 @@
+"""
+Unit tests for CheckpointManager
+"""
+
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from infrastructure.training.checkpoint_manager import CheckpointManager  # noqa: E402
+from domain.exceptions import ConfigurationError  # noqa: E402
+
+
+@pytest.fixture
+def model():
+    """Tiny model to checkpoint."""
+    return torch.nn.Linear(4, 2)
+
+
+def save_all(manager, model, metric_values):
+    """Save one checkpoint per metric value, one step apart."""
+    for step, value in enumerate(metric_values):
+        manager.save_checkpoint(model, epoch=0, step=step, metric_value=value)
+
+
+class TestCheckpointManager:
+    """Test checkpoint saving, best tracking and cleanup."""
+
+    @pytest.mark.unit
+    def test_invalid_mode_rejected(self, temp_dir):
+        """Test that an unknown mode raises ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            CheckpointManager(checkpoint_dir=str(temp_dir), mode='median')
+
+    @pytest.mark.unit
+    def test_cleanup_keeps_lowest_in_min_mode(self, temp_dir, model):
+        """Test that min mode keeps the N lowest metrics, best first."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=2, mode='min')
+        save_all(manager, model, [0.5, 0.3, 0.4, 0.6])
+
+        kept = manager.get_all_checkpoints()
+        assert [cp.metric_value for cp in kept] == [0.3, 0.4]
+        assert [cp.step for cp in kept] == [1, 2]
+
+    @pytest.mark.unit
+    def test_cleanup_keeps_highest_in_max_mode(self, temp_dir, model):
+        """Test that max mode keeps the N highest metrics, best first."""
+        manager = CheckpointManager(
+            checkpoint_dir=str(temp_dir), max_checkpoints=2,
+            metric_name='eval_accuracy', mode='max'
+        )
+        save_all(manager, model, [0.5, 0.9, 0.7, 0.6])
+
+        kept = manager.get_all_checkpoints()
+        assert [cp.metric_value for cp in kept] == [0.9, 0.7]
+
+    @pytest.mark.unit
+    def test_cleanup_removes_files(self, temp_dir, model):
+        """Test that dropped checkpoints are deleted from disk."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=2, mode='min')
+        save_all(manager, model, [0.5, 0.3, 0.4, 0.6])
+
+        remaining = sorted(p.name for p in temp_dir.glob('checkpoint_epoch*_step*.pt'))
+        assert remaining == ['checkpoint_epoch0_step1.pt', 'checkpoint_epoch0_step2.pt']
+
+    @pytest.mark.unit
+    def test_best_checkpoint_tracked(self, temp_dir, model):
+        """Test that the best checkpoint is flagged and copied to best_model.pt."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min')
+        save_all(manager, model, [0.5, 0.3, 0.4])
+
+        best = manager.get_best_checkpoint_info()
+        assert best.step == 1
+        assert sum(cp.is_best for cp in manager.get_all_checkpoints()) == 1
+
+        best_model_path = temp_dir / 'best_model.pt'
+        checkpoint_path = temp_dir / best.filename
+        assert best_model_path.read_bytes() == checkpoint_path.read_bytes()
+        assert os.stat(best_model_path).st_mtime == os.stat(checkpoint_path).st_mtime
+
+    @pytest.mark.unit
+    def test_scan_restores_best_flag(self, temp_dir, model):
+        """Test that rebuilding metadata from disk recovers the best checkpoint."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min')
+        save_all(manager, model, [0.5, 0.3, 0.4])
+
+        checkpoints = manager.scan_checkpoints()
+        assert [cp.step for cp in checkpoints] == [0, 1, 2]
+        assert [cp.step for cp in checkpoints if cp.is_best] == [1]
+
+    @pytest.mark.unit
+    def test_existing_files_not_adopted_by_default(self, temp_dir, model):
+        """Test that a new manager without metadata starts with an empty history."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min')
+        save_all(manager, model, [0.5, 0.3])
+        manager.metadata_file.unlink()
+
+        fresh = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min')
+        assert fresh.get_all_checkpoints() == []
+
+    @pytest.mark.unit
+    def test_recover_from_disk_adopts_files(self, temp_dir, model):
+        """Test that recover_from_disk rebuilds the history from checkpoint files."""
+        manager = CheckpointManager(checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min')
+        save_all(manager, model, [0.5, 0.3])
+        manager.metadata_file.unlink()
+
+        recovered = CheckpointManager(
+            checkpoint_dir=str(temp_dir), max_checkpoints=3, mode='min', recover_from_disk=True
+        )
+        assert [cp.step for cp in recovered.get_all_checkpoints()] == [0, 1]
+        assert recovered.get_best_checkpoint_info().step == 1
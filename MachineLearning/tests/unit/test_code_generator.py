@@ -0,0 +1,178 @@
+"""
+Unit tests for CodeGenerator
+"""
+
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from infrastructure.inference.code_generator import (  # noqa: E402
+    CodeGenerator,
+    GenerationConfig,
+    ModelType,
+)
+
+VOCAB_SIZE = 50
+EOS_TOKEN_ID = 0
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer over integer token ids."""
+
+    eos_token_id = EOS_TOKEN_ID
+
+    def __call__(self, text, return_tensors=None, add_special_tokens=True):
+        ids = [int(tok) for tok in text.split()]
+        return {'input_ids': torch.tensor([ids], dtype=torch.long)}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(str(int(i)) for i in ids)
+
+
+class FakeCausalModel:
+    """
+    Causal LM whose next token depends on the whole context.
+
+    The "KV cache" is the list of token ids already processed, so a cache
+    missing a token changes every following prediction. Like DynamicCache,
+    it is extended in place.
+    """
+
+    def __call__(self, input_ids, past_key_values=None, use_cache=True):
+        history = past_key_values if past_key_values is not None else []
+        history.extend(input_ids[0].tolist())
+        next_token = 1 + (sum(history) * 31 + len(history)) % (VOCAB_SIZE - 1)
+
+        logits = torch.zeros(1, input_ids.shape[1], VOCAB_SIZE)
+        logits[0, -1, next_token] = 1.0
+        return SimpleNamespace(logits=logits, past_key_values=history)
+
+
+@pytest.fixture
+def generator():
+    """Create a causal CodeGenerator around the fake model."""
+    gen = CodeGenerator.__new__(CodeGenerator)
+    gen.model_type = ModelType.CAUSAL
+    gen.model = FakeCausalModel()
+    gen.tokenizer = FakeTokenizer()
+    gen.device = torch.device('cpu')
+    gen._lock = threading.RLock()
+    gen.config = GenerationConfig(max_new_tokens=4, do_sample=False)
+    gen.prefix_cache_size = 8
+    gen._prefix_cache = OrderedDict()
+    return gen
+
+
+class TestGenerationConfig:
+    """Test generation config defaults and generate() kwargs."""
+
+    @pytest.mark.unit
+    def test_seq2seq_defaults_use_beam_search(self):
+        """Test that seq2seq models decode deterministically with beams."""
+        config = GenerationConfig.for_model_type(ModelType.SEQ2SEQ)
+        assert config.do_sample is False
+        assert config.num_beams == 4
+
+    @pytest.mark.unit
+    def test_causal_defaults_use_sampling(self):
+        """Test that causal models sample without beams."""
+        config = GenerationConfig.for_model_type(ModelType.CAUSAL)
+        assert config.do_sample is True
+        assert config.num_beams == 1
+
+    @pytest.mark.unit
+    def test_greedy_dict_omits_sampling_params(self):
+        """Test that greedy decoding drops sampling and beam-only settings."""
+        kwargs = GenerationConfig(do_sample=False, num_beams=1).to_dict()
+        assert 'temperature' not in kwargs
+        assert 'top_p' not in kwargs
+        assert 'top_k' not in kwargs
+        assert 'early_stopping' not in kwargs
+
+    @pytest.mark.unit
+    def test_sampling_dict_includes_sampling_params(self):
+        """Test that sampling passes temperature, top_p and top_k."""
+        kwargs = GenerationConfig(do_sample=True, temperature=0.5).to_dict()
+        assert kwargs['temperature'] == 0.5
+        assert 'top_p' in kwargs
+        assert 'top_k' in kwargs
+
+    @pytest.mark.unit
+    def test_beam_dict_includes_early_stopping(self):
+        """Test that beam search passes early_stopping."""
+        kwargs = GenerationConfig(do_sample=False, num_beams=4).to_dict()
+        assert kwargs['early_stopping'] is True
+
+
+class TestGenerateIncremental:
+    """Test KV-cache reuse across incremental generation calls."""
+
+    @pytest.mark.unit
+    def test_cache_covers_generated_tokens(self, generator):
+        """Test that the returned cache includes every generated token."""
+        text, cache = generator.generate_incremental("1 2 3")
+        assert len(text.split()) == 4
+        assert len(cache) == 3 + 4
+
+    @pytest.mark.unit
+    def test_split_matches_uninterrupted(self, generator):
+        """Test that resuming from the cache equals one uninterrupted call."""
+        first, cache = generator.generate_incremental("1 2 3")
+        resumed, _ = generator.generate_incremental("7 8", past_key_values=cache)
+
+        full, _ = generator.generate_incremental(f"1 2 3 {first} 7 8")
+        assert resumed == full
+
+    @pytest.mark.unit
+    def test_cache_resumed_twice(self, generator):
+        """Test that one cache can be resumed with different follow-ups."""
+        first, cache = generator.generate_incremental("1 2 3")
+        snapshot = list(cache)
+
+        for follow_up in ("7 8", "9"):
+            resumed, _ = generator.generate_incremental(follow_up, past_key_values=cache)
+            full, _ = generator.generate_incremental(f"1 2 3 {first} {follow_up}")
+            assert resumed == full
+
+        assert cache == snapshot
+
+    @pytest.mark.unit
+    def test_zero_new_tokens_covers_prompt(self, generator):
+        """Test that the cache covers the prompt even without generating."""
+        text, cache = generator.generate_incremental(
+            "1 2 3", config=GenerationConfig(max_new_tokens=0, do_sample=False)
+        )
+        assert text == ""
+        assert cache == [1, 2, 3]
+
+    @pytest.mark.unit
+    def test_prefix_cache_matches_uninterrupted(self, generator):
+        """Test that cached prefixes give the same output as full prompts."""
+        for follow_up in ("7 8", "9"):
+            resumed, _ = generator.generate_incremental(follow_up, prefix="1 2 3")
+            full, _ = generator.generate_incremental(f"1 2 3 {follow_up}")
+            assert resumed == full
+
+        assert len(generator._prefix_cache) == 1
+
+    @pytest.mark.unit
+    def test_prefix_and_cache_exclusive(self, generator):
+        """Test that prefix and past_key_values cannot be combined."""
+        from domain.exceptions import InferenceError
+
+        with pytest.raises(InferenceError):
+            generator.generate_incremental("7", past_key_values=[1], prefix="1 2 3")
+
+    @pytest.mark.unit
+    def test_requires_causal_model(self, generator):
+        """Test that seq2seq models are rejected."""
+        from domain.exceptions import InferenceError
+
+        generator.model_type = ModelType.SEQ2SEQ
+        with pytest.raises(InferenceError):
+            generator.generate_incremental("1 2 3")
@@ -0,0 +1,195 @@
+"""
+Unit tests for CodeDataset tokenization and batching
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from infrastructure.training.dataset_loader import CodeDataset  # noqa: E402
+
+BOS_TOKEN_ID = 1
+EOS_TOKEN_ID = 2
+PAD_TOKEN_ID = 0
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer over integer token ids, with a BOS special token."""
+
+    pad_token_id = PAD_TOKEN_ID
+    eos_token_id = EOS_TOKEN_ID
+    name_or_path = 'fake-tokenizer'
+
+    def __call__(self, texts, max_length=None, padding=False, truncation=False,
+                 add_special_tokens=True):
+        input_ids = []
+        for text in texts:
+            ids = [int(tok) for tok in text.split()]
+            if add_special_tokens:
+                ids = [BOS_TOKEN_ID] + ids
+            if truncation and max_length is not None:
+                ids = ids[:max_length]
+            input_ids.append(ids)
+        return {'input_ids': input_ids}
+
+    def __len__(self):
+        return 100
+
+
+@pytest.fixture
+def tokenizer():
+    """Create the fake tokenizer."""
+    return FakeTokenizer()
+
+
+class TestCollate:
+    """Test dynamic padding in collate_fn."""
+
+    @pytest.mark.unit
+    def test_generation_batch_padding(self, tokenizer):
+        """Test pad ids, attention mask and -100 label padding."""
+        dataset = CodeDataset(
+            samples=[
+                {'code': '', 'description': '10', 'target': '20'},
+                {'code': '', 'description': '10 11 12', 'target': '20 21'},
+            ],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=32,
+            pad_to_multiple_of=8
+        )
+        batch = dataset.collate_fn([dataset[0], dataset[1]])
+
+        # Longest input is 4 tokens, rounded up to 8
+        assert batch['input_ids'].shape == (2, 8)
+        assert batch['input_ids'][0].tolist() == [BOS_TOKEN_ID, 10, 0, 0, 0, 0, 0, 0]
+        assert batch['attention_mask'][0].tolist() == [1, 1, 0, 0, 0, 0, 0, 0]
+        assert batch['attention_mask'][1].tolist() == [1, 1, 1, 1, 0, 0, 0, 0]
+        assert batch['labels'][0].tolist() == [BOS_TOKEN_ID, 20, -100, -100, -100, -100, -100, -100]
+        assert batch['labels'][1].tolist() == [BOS_TOKEN_ID, 20, 21, -100, -100, -100, -100, -100]
+
+    @pytest.mark.unit
+    def test_classification_labels_stacked(self, tokenizer):
+        """Test that classification labels become one index per sample."""
+        dataset = CodeDataset(
+            samples=[{'code': '10', 'label': 'safe'}, {'code': '11', 'label': 'high'}],
+            tokenizer=tokenizer,
+            task='security_classification'
+        )
+        batch = dataset.collate_fn([dataset[0], dataset[1]])
+
+        assert batch['labels'].tolist() == [dataset.label_map['safe'], dataset.label_map['high']]
+
+    @pytest.mark.unit
+    def test_padding_without_multiple(self, tokenizer):
+        """Test that pad_to_multiple_of=None pads only to the longest sample."""
+        dataset = CodeDataset(
+            samples=[{'code': '10 11', 'label': 'a'}, {'code': '10 11 12 13', 'label': 'b'}],
+            tokenizer=tokenizer,
+            task='text_classification',
+            pad_to_multiple_of=None
+        )
+        batch = dataset.collate_fn([dataset[0], dataset[1]])
+
+        assert batch['input_ids'].shape == (2, 5)
+        assert batch['attention_mask'].sum(dim=1).tolist() == [3, 5]
+
+    @pytest.mark.unit
+    def test_subset_shares_encodings(self, tokenizer):
+        """Test that subset() selects the matching encodings."""
+        dataset = CodeDataset(
+            samples=[{'code': str(10 + i), 'label': str(i % 2)} for i in range(4)],
+            tokenizer=tokenizer,
+            task='text_classification'
+        )
+        subset = dataset.subset([3, 1])
+
+        assert len(subset) == 2
+        assert subset[0]['input_ids'].tolist() == [BOS_TOKEN_ID, 13]
+        assert subset[1]['labels'].item() == dataset.label_map['1']
+
+
+class TestCausalPacking:
+    """Test prompt + target packing for causal code generation."""
+
+    @pytest.mark.unit
+    def test_prompt_masked_in_labels(self, tokenizer):
+        """Test that prompt positions are -100 and target + EOS are kept."""
+        dataset = CodeDataset(
+            samples=[{'code': '', 'description': '10 11', 'target': '20 21 22'}],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=32,
+            model_type='causal'
+        )
+        sample = dataset[0]
+
+        assert sample['input_ids'].tolist() == [BOS_TOKEN_ID, 10, 11, 20, 21, 22, EOS_TOKEN_ID]
+        assert sample['labels'].tolist() == [-100, -100, -100, 20, 21, 22, EOS_TOKEN_ID]
+
+    @pytest.mark.unit
+    def test_packed_sequence_truncated(self, tokenizer):
+        """Test that the packed sequence never exceeds max_length."""
+        dataset = CodeDataset(
+            samples=[{'code': '', 'description': '10 11', 'target': '20 21 22 23 24 25'}],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=6,
+            model_type='causal'
+        )
+        sample = dataset[0]
+
+        assert sample['input_ids'].tolist() == [BOS_TOKEN_ID, 10, 11, 20, 21, 22]
+        assert sample['labels'].tolist() == [-100, -100, -100, 20, 21, 22]
+
+    @pytest.mark.unit
+    def test_seq2seq_labels_are_target(self, tokenizer):
+        """Test that without causal packing the labels are the encoded target."""
+        dataset = CodeDataset(
+            samples=[{'code': '', 'description': '10 11', 'target': '20 21'}],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=32,
+            model_type='seq2seq'
+        )
+        sample = dataset[0]
+
+        assert sample['input_ids'].tolist() == [BOS_TOKEN_ID, 10, 11]
+        assert sample['labels'].tolist() == [BOS_TOKEN_ID, 20, 21]
+
+    @pytest.mark.unit
+    def test_long_prompt_keeps_target(self, tokenizer):
+        """Test that a prompt longer than max_length still leaves supervised tokens."""
+        dataset = CodeDataset(
+            samples=[{'code': '', 'description': '10', 'target': '20'}],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=6,
+            model_type='causal'
+        )
+        input_ids, labels = dataset._pack_causal(
+            [torch.arange(10, 20)], [torch.tensor([20, 21])]
+        )
+
+        assert input_ids[0].tolist() == [10, 11, 12, 20, 21, EOS_TOKEN_ID]
+        assert labels[0].tolist() == [-100, -100, -100, 20, 21, EOS_TOKEN_ID]
+
+    @pytest.mark.unit
+    def test_causal_batch_masks_prompt_and_padding(self, tokenizer):
+        """Test that collated causal labels mask both prompt and padding."""
+        dataset = CodeDataset(
+            samples=[
+                {'code': '', 'description': '10', 'target': '20'},
+                {'code': '', 'description': '10 11 12', 'target': '20 21'},
+            ],
+            tokenizer=tokenizer,
+            task='code_generation',
+            max_length=32,
+            pad_to_multiple_of=8,
+            model_type='causal'
+        )
+        batch = dataset.collate_fn([dataset[0], dataset[1]])
+
+        assert batch['input_ids'][0].tolist() == [BOS_TOKEN_ID, 10, 20, EOS_TOKEN_ID, 0, 0, 0, 0]
+        assert batch['labels'][0].tolist() == [-100, -100, 20, EOS_TOKEN_ID, -100, -100, -100, -100]
+        assert batch['attention_mask'][1].tolist() == [1, 1, 1, 1, 1, 1, 1, 0]
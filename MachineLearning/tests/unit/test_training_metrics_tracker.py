@@ -0,0 +1,97 @@
+"""
+Unit tests for TrainingMetricsTracker
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+
+from infrastructure.training.training_metrics_tracker import (  # noqa: E402
+    TrainingMetricsTracker,
+    _RunningStatistics,
+)
+
+
+class TestRunningStatistics:
+    """Test the incremental (Welford) statistics."""
+
+    @pytest.mark.unit
+    def test_matches_numpy(self):
+        """Test that mean/std/min/max match numpy on the same values."""
+        values = np.random.default_rng(0).normal(loc=3.0, scale=2.0, size=1000)
+
+        running = _RunningStatistics()
+        for value in values:
+            running.update(float(value))
+        stats = running.to_statistics('loss')
+
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std == pytest.approx(np.std(values, ddof=1))
+        assert stats.min == pytest.approx(np.min(values))
+        assert stats.max == pytest.approx(np.max(values))
+        assert stats.last == pytest.approx(values[-1])
+
+    @pytest.mark.unit
+    def test_single_value_has_zero_std(self):
+        """Test that one value gives std 0 instead of dividing by zero."""
+        running = _RunningStatistics()
+        running.update(1.5)
+        stats = running.to_statistics('loss')
+
+        assert stats.mean == 1.5
+        assert stats.std == 0.0
+
+
+class TestTrainingMetricsTracker:
+    """Test metric logging and best-metric tracking."""
+
+    @pytest.fixture
+    def tracker(self, temp_dir):
+        """Create a tracker without auto-save."""
+        return TrainingMetricsTracker(output_dir=str(temp_dir), auto_save=False)
+
+    @pytest.mark.unit
+    def test_statistics_from_logged_values(self, tracker):
+        """Test that logged values are reflected in the statistics."""
+        values = [0.9, 0.7, 0.8, 0.4]
+        for step, value in enumerate(values):
+            tracker.log_metric('train_loss', value, step=step)
+
+        stats = tracker.get_metric_statistics('train_loss')
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std == pytest.approx(np.std(values, ddof=1))
+
+    @pytest.mark.unit
+    def test_unknown_metric_has_no_statistics(self, tracker):
+        """Test that an unknown metric returns None."""
+        assert tracker.get_metric_statistics('missing') is None
+
+    @pytest.mark.unit
+    def test_best_loss_is_lowest(self, tracker):
+        """Test that loss metrics keep the lowest value."""
+        for step, value in enumerate([0.9, 0.3, 0.5]):
+            tracker.log_metric('eval_loss', value, step=step)
+
+        best = tracker.get_best_metrics()['eval_loss']
+        assert best['value'] == pytest.approx(0.3)
+        assert best['step'] == 1
+
+    @pytest.mark.unit
+    def test_best_accuracy_is_highest(self, tracker):
+        """Test that non-loss metrics keep the highest value."""
+        for step, value in enumerate([0.6, 0.9, 0.8]):
+            tracker.log_metric('eval_accuracy', value, step=step)
+
+        best = tracker.get_best_metrics()['eval_accuracy']
+        assert best['value'] == pytest.approx(0.9)
+        assert best['step'] == 1
+
+    @pytest.mark.unit
+    def test_best_metrics_returns_copies(self, tracker):
+        """Test that callers cannot mutate the tracked best values."""
+        tracker.log_metric('eval_loss', 0.5, step=0)
+        tracker.get_best_metrics()['eval_loss']['value'] = -1.0
+
+        assert tracker.get_best_metrics()['eval_loss']['value'] == pytest.approx(0.5)
@@ -35,6 +35,12 @@ Usage:
     # Resume from checkpoint
     python domain_adaptive_trainer.py --resume-from models/checkpoint-1000
 
+    # Datasets larger than RAM (read lazily, step budget instead of epochs)
+    python domain_adaptive_trainer.py --dataset huge.jsonl --streaming --max-steps 20000
+
+    # Multi-GPU (DistributedDataParallel, one process per GPU)
+    torchrun --nproc_per_node=4 domain_adaptive_trainer.py --dataset dataset.jsonl
+
 Author: ML Code Intelligence Project
 """
 
@@ -46,9 +52,7 @@ import logging
 import torch
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from tqdm import tqdm
-import numpy as np
+from typing import List, Optional, Tuple
 
 # Add parent directory
 sys.path.append(str(Path(__file__).parent.parent))
@@ -59,14 +63,10 @@ from transformers import (
     Trainer,
     TrainingArguments,
     DataCollatorForLanguageModeling,
-    EarlyStoppingCallback,
-    get_linear_schedule_with_warmup
+    EarlyStoppingCallback
 )
-from datasets import load_dataset, Dataset
-from torch.utils.data import DataLoader
-import torch.nn.functional as F
+from datasets import load_dataset, load_from_disk, Dataset, DatasetDict, IterableDataset
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -91,8 +91,11 @@ class DomainAdaptiveTrainer:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Device configuration
-        self.device = torch.device("cuda" if use_gpu and torch.cuda.is_available() else "cpu")
+        # Device configuration (under torchrun each process owns its LOCAL_RANK GPU)
+        if use_gpu and torch.cuda.is_available():
+            self.device = torch.device("cuda", int(os.environ.get("LOCAL_RANK", 0)))
+        else:
+            self.device = torch.device("cpu")
         logger.info(f"Using device: {self.device}")
 
         # Load model and tokenizer
@@ -124,11 +127,13 @@ class DomainAdaptiveTrainer:
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
 
-            # Load model
+            # Load model in FP32: mixed precision training keeps FP32 master
+            # weights and autocasts the forward pass (the AMP grad scaler
+            # refuses to unscale FP16 gradients)
             self.model = AutoModelForCausalLM.from_pretrained(
                 self.base_model_name,
                 trust_remote_code=True,
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32,
+                torch_dtype=torch.float32,
                 low_cpu_mem_usage=True
             )
 
@@ -148,88 +153,119 @@ class DomainAdaptiveTrainer:
             logger.error(f"Failed to load model: {e}")
             raise
 
-    def prepare_dataset(self, dataset_path: str, max_length: int = 1024) -> Tuple[Dataset, Dataset]:
+    def prepare_dataset(self,
+                        dataset_path: str,
+                        max_length: int = 1024,
+                        num_proc: Optional[int] = None,
+                        batch_size: int = 1000,
+                        streaming: bool = False,
+                        val_size: int = 1000) -> Tuple[Dataset, Dataset]:
         """
         Prepare dataset for training.
 
         Args:
             dataset_path: Path to JSONL dataset file(s)
             max_length: Maximum sequence length
+            num_proc: Worker processes for formatting and tokenization
+                (default: half the CPUs)
+            batch_size: Rows per batched map call; larger batches amortize the
+                per-call overhead of the fast tokenizer
+            streaming: Read and tokenize examples lazily as an IterableDataset
+                instead of converting the whole file to Arrow first. Startup
+                is immediate and memory stays constant, but train() then
+                needs max_steps
+            val_size: Number of leading examples held out for validation when
+                streaming (the in-memory path uses a 90/10 split)
 
         Returns:
             Train and validation datasets
         """
         logger.info(f"Preparing dataset from: {dataset_path}")
 
-        # Handle wildcards
-        dataset_files = []
-        if '*' in dataset_path:
-            dataset_files = list(Path(dataset_path).parent.glob(Path(dataset_path).name))
-        else:
-            dataset_files = [Path(dataset_path)]
+        data_files = self._resolve_data_files(dataset_path)
 
-        logger.info(f"Found {len(dataset_files)} dataset files")
+        # Parse straight into Arrow tables (memory-mapped cache), no Python list of dicts
+        raw_dataset = load_dataset("json", data_files=data_files, split="train", streaming=streaming)
+
+        map_kwargs = {'batched': True, 'batch_size': batch_size}
+        if streaming:
+            # Schema isn't known up front when streaming; peek at one example
+            column_names = raw_dataset.column_names or list(next(iter(raw_dataset)).keys())
+            logger.info("Streaming examples from disk")
+        else:
+            column_names = raw_dataset.column_names
+            logger.info(f"Loaded {len(raw_dataset)} examples")
 
-        # Load all examples
-        all_examples = []
-        for file_path in dataset_files:
-            if file_path.suffix == '.jsonl':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        example = json.loads(line)
-                        all_examples.append(example)
-            elif file_path.suffix == '.json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        all_examples.extend(data)
-                    else:
-                        all_examples.append(data)
-
-        logger.info(f"Loaded {len(all_examples)} examples")
+            if num_proc is None:
+                num_proc = max(1, (os.cpu_count() or 1) // 2)
+            # Worker processes tokenize in parallel; avoid nested Rust threads per worker
+            if num_proc > 1:
+                os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+            # Spawning workers only pays off with at least one full batch each
+            map_kwargs['num_proc'] = num_proc if len(raw_dataset) >= batch_size * num_proc else None
 
         # Format for training
-        formatted_examples = []
-        for ex in all_examples:
-            # Create training text from input-output pairs
-            if 'input' in ex and 'output' in ex:
-                # Format with clear separation
-                text = f"### Instruction:\n{ex['input']}\n\n### Response:\n{ex['output']}"
-
-                # Add context if available
-                if 'context' in ex and isinstance(ex['context'], dict):
-                    imports = ex['context'].get('imports', [])
-                    if imports:
-                        imports_text = '\n'.join(imports[:5])  # Limit imports
-                        text = f"{imports_text}\n\n{text}"
-
-            elif 'output' in ex:
-                # Just use output if no input
-                text = ex['output']
-            else:
-                # Skip if no useful data
-                continue
-
-            formatted_examples.append({'text': text})
-
-        # Create dataset
-        dataset = Dataset.from_list(formatted_examples)
-
-        # Tokenize
+        def format_function(batch):
+            num_rows = len(next(iter(batch.values())))
+            inputs = batch.get('input', [None] * num_rows)
+            outputs = batch.get('output', [None] * num_rows)
+            contexts = batch.get('context', [None] * num_rows)
+
+            texts = []
+            for input_text, output_text, context in zip(inputs, outputs, contexts):
+                # Create training text from input-output pairs
+                if input_text is not None and output_text is not None:
+                    # Format with clear separation
+                    text = f"### Instruction:\n{input_text}\n\n### Response:\n{output_text}"
+
+                    # Add context if available
+                    if isinstance(context, dict):
+                        imports = context.get('imports') or []
+                        if imports:
+                            imports_text = '\n'.join(imports[:5])  # Limit imports
+                            text = f"{imports_text}\n\n{text}"
+
+                elif output_text is not None:
+                    # Just use output if no input
+                    text = output_text
+                else:
+                    # Skipped below if no useful data
+                    text = ''
+
+                texts.append(text)
+
+            return {'text': texts}
+
+        dataset = raw_dataset.map(
+            format_function,
+            remove_columns=column_names,
+            **map_kwargs
+        )
+        dataset = dataset.filter(lambda batch: [bool(t) for t in batch['text']], batched=True)
+
+        # Tokenize without padding; the data collator pads each batch to its
+        # longest sequence instead of every row to max_length
         def tokenize_function(examples):
             return self.tokenizer(
                 examples['text'],
                 truncation=True,
-                padding='max_length',
                 max_length=max_length
             )
 
         tokenized_dataset = dataset.map(
             tokenize_function,
-            batched=True,
-            remove_columns=['text']
+            remove_columns=['text'],
+            **map_kwargs
         )
 
+        if streaming:
+            # Hold out the first val_size examples; shuffle the rest in a buffer
+            val_dataset = tokenized_dataset.take(val_size)
+            train_dataset = tokenized_dataset.skip(val_size).shuffle(seed=42, buffer_size=10_000)
+
+            logger.info(f"Dataset prepared (streaming, {val_size} validation examples)")
+            return train_dataset, val_dataset
+
         # Split into train/validation (90/10)
         split_dataset = tokenized_dataset.train_test_split(test_size=0.1, seed=42)
 
@@ -239,6 +275,109 @@ class DomainAdaptiveTrainer:
 
         return split_dataset['train'], split_dataset['test']
 
+    @staticmethod
+    def _resolve_data_files(dataset_path: str) -> List[str]:
+        """Expand a dataset path (wildcards allowed) into JSON/JSONL files."""
+        if '*' in dataset_path:
+            dataset_files = sorted(Path(dataset_path).parent.glob(Path(dataset_path).name))
+        else:
+            dataset_files = [Path(dataset_path)]
+
+        logger.info(f"Found {len(dataset_files)} dataset files")
+        return [str(p) for p in dataset_files if p.suffix in ('.jsonl', '.json')]
+
+    def prepare_data(self,
+                     dataset_path: str,
+                     cache_dir: str,
+                     max_length: int = 1024,
+                     num_proc: Optional[int] = None) -> Tuple[Dataset, Dataset]:
+        """
+        Prepare the dataset once and reuse the tokenized Arrow copy afterwards.
+
+        The first run tokenizes via prepare_dataset() and saves the splits
+        with save_to_disk(); later runs memory-map them with load_from_disk()
+        instead of re-parsing the JSON. The cache is rebuilt when the dataset
+        path, the data files' size or mtime, max_length or the tokenizer
+        differ from the saved one.
+
+        Under torchrun only the local main process builds the cache; the
+        other ranks wait on a barrier and then load it from disk.
+
+        Args:
+            dataset_path: Path to JSONL dataset file(s)
+            cache_dir: Directory for the tokenized Arrow dataset
+            max_length: Maximum sequence length
+            num_proc: Worker processes for tokenization
+
+        Returns:
+            Train and validation datasets
+        """
+        cache_path = Path(cache_dir)
+
+        distributed = int(os.environ.get("WORLD_SIZE", 1)) > 1
+        if distributed and not torch.distributed.is_initialized():
+            # Trainer reuses an existing process group
+            if torch.cuda.is_available():
+                torch.cuda.set_device(self.device)
+            torch.distributed.init_process_group(
+                backend="nccl" if torch.cuda.is_available() else "gloo"
+            )
+
+        if distributed and int(os.environ.get("LOCAL_RANK", 0)) != 0:
+            torch.distributed.barrier()
+            splits = load_from_disk(str(cache_path))
+            logger.info(f"Loaded tokenized dataset from {cache_path}")
+            return splits['train'], splits['validation']
+
+        try:
+            return self._build_or_load_data(dataset_path, cache_path, max_length, num_proc)
+        finally:
+            if distributed:
+                # Release the ranks waiting for the cache
+                torch.distributed.barrier()
+
+    def _build_or_load_data(self,
+                            dataset_path: str,
+                            cache_path: Path,
+                            max_length: int,
+                            num_proc: Optional[int]) -> Tuple[Dataset, Dataset]:
+        """Load the tokenized cache if it is current, otherwise rebuild it."""
+        meta_path = cache_path / "prepare_meta.json"
+        data_files = []
+        for data_file in self._resolve_data_files(dataset_path):
+            stat = os.stat(data_file)
+            data_files.append([data_file, stat.st_size, stat.st_mtime_ns])
+        meta = {
+            'dataset_path': dataset_path,
+            'data_files': data_files,
+            'max_length': max_length,
+            'tokenizer': self.tokenizer.name_or_path,
+            'vocab_size': len(self.tokenizer)
+        }
+
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                cached_meta = json.load(f)
+            if cached_meta == meta:
+                splits = load_from_disk(str(cache_path))
+                logger.info(f"Loaded tokenized dataset from {cache_path}")
+                return splits['train'], splits['validation']
+            logger.info(f"Tokenized dataset at {cache_path} is stale, rebuilding")
+
+        train_dataset, val_dataset = self.prepare_dataset(
+            dataset_path=dataset_path,
+            max_length=max_length,
+            num_proc=num_proc
+        )
+
+        DatasetDict({'train': train_dataset, 'validation': val_dataset}).save_to_disk(str(cache_path))
+        # Written last, so an interrupted save is never mistaken for a valid cache
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        logger.info(f"Saved tokenized dataset to {cache_path}")
+        return train_dataset, val_dataset
+
     def train(self,
              train_dataset: Dataset,
              val_dataset: Dataset,
@@ -250,7 +389,9 @@ class DomainAdaptiveTrainer:
              fp16: bool = True,
              save_steps: int = 500,
              eval_steps: int = 500,
-             logging_steps: int = 50):
+             logging_steps: int = 50,
+             torch_compile: bool = False,
+             max_steps: int = -1):
         """
         Perform domain-adaptive training.
 
@@ -262,25 +403,43 @@ class DomainAdaptiveTrainer:
             learning_rate: Learning rate (should be lower than pre-training)
             warmup_ratio: Warmup ratio for learning rate
             gradient_accumulation_steps: Gradient accumulation steps
-            fp16: Use mixed precision training
+            fp16: Use mixed precision training (BF16 on GPUs that support it,
+                FP16 otherwise)
             save_steps: Save checkpoint every N steps
             eval_steps: Evaluate every N steps
             logging_steps: Log metrics every N steps
+            torch_compile: Compile the model with torch.compile (PyTorch 2.0+)
+            max_steps: Total optimization steps, overriding num_epochs
+                (required for streaming datasets, which have no length)
+
+        Raises:
+            ValueError: If train_dataset is streaming and max_steps is not set
         """
+        if isinstance(train_dataset, IterableDataset) and max_steps <= 0:
+            raise ValueError("max_steps must be set when training on a streaming dataset")
+
         logger.info("="*60)
         logger.info("STARTING DOMAIN ADAPTIVE TRAINING")
         logger.info("="*60)
 
+        # BF16 has FP32's exponent range, so it needs no loss scaling
+        use_amp = fp16 and self.device.type == "cuda"
+        use_bf16 = use_amp and torch.cuda.is_bf16_supported()
+        torch_compile = torch_compile and hasattr(torch, 'compile')
+
         # Training arguments
         training_args = TrainingArguments(
             output_dir=str(self.output_dir),
             num_train_epochs=num_epochs,
+            max_steps=max_steps,
             per_device_train_batch_size=batch_size,
             per_device_eval_batch_size=batch_size,
             gradient_accumulation_steps=gradient_accumulation_steps,
             warmup_ratio=warmup_ratio,
             learning_rate=learning_rate,
-            fp16=fp16 and self.device.type == "cuda",
+            fp16=use_amp and not use_bf16,
+            bf16=use_bf16,
+            torch_compile=torch_compile,
             logging_dir=str(self.output_dir / "logs"),
             logging_steps=logging_steps,
             save_steps=save_steps,
@@ -294,6 +453,8 @@ class DomainAdaptiveTrainer:
             push_to_hub=False,
             report_to=["tensorboard"],  # Use TensorBoard for logging
             dataloader_drop_last=True,
+            # Every parameter gets a gradient; skip DDP's unused-parameter graph scan
+            ddp_find_unused_parameters=False,
             remove_unused_columns=False,
             label_names=["input_ids"],
         )
@@ -324,7 +485,8 @@ class DomainAdaptiveTrainer:
         logger.info(f"  Batch size: {batch_size}")
         logger.info(f"  Learning rate: {learning_rate}")
         logger.info(f"  Warmup ratio: {warmup_ratio}")
-        logger.info(f"  Mixed precision: {fp16}")
+        logger.info(f"  Mixed precision: {'bf16' if use_bf16 else 'fp16' if use_amp else 'off'}")
+        logger.info(f"  torch.compile: {torch_compile}")
         logger.info(f"  Gradient accumulation: {gradient_accumulation_steps}")
 
         start_time = datetime.now()
@@ -390,8 +552,8 @@ class DomainAdaptiveTrainer:
             # Tokenize
             inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
 
-            # Generate
-            with torch.no_grad():
+            # Generate (inference_mode also skips autograd view/version tracking)
+            with torch.inference_mode():
                 outputs = self.model.generate(
                     **inputs,
                     max_length=100,
@@ -454,6 +616,12 @@ def main():
                        help='Path to dataset file (JSONL or JSON)')
     parser.add_argument('--max-length', type=int, default=1024,
                        help='Maximum sequence length (default: 1024)')
+    parser.add_argument('--num-proc', type=int, default=None,
+                       help='Worker processes for tokenization (default: half the CPUs)')
+    parser.add_argument('--data-cache-dir', type=str, default=None,
+                       help='Save the tokenized dataset here and reuse it on later runs')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Stream the dataset instead of loading it into memory (requires --max-steps)')
 
     # Training parameters
     parser.add_argument('--epochs', type=int, default=3,
@@ -466,6 +634,8 @@ def main():
                        help='Warmup ratio (default: 0.1)')
     parser.add_argument('--gradient-accumulation', type=int, default=1,
                        help='Gradient accumulation steps (default: 1)')
+    parser.add_argument('--max-steps', type=int, default=-1,
+                       help='Total training steps, overrides --epochs (default: -1)')
 
     # Output
     parser.add_argument('--output-dir', type=str, default='models/adapted',
@@ -476,6 +646,8 @@ def main():
                        help='Use mixed precision training')
     parser.add_argument('--cpu', action='store_true',
                        help='Force CPU usage')
+    parser.add_argument('--torch-compile', action='store_true',
+                       help='Compile the model with torch.compile')
 
     # Evaluation
     parser.add_argument('--evaluate', action='store_true',
@@ -483,6 +655,9 @@ def main():
 
     args = parser.parse_args()
 
+    # Configure logging only when run as a script, not on import
+    logging.basicConfig(level=logging.INFO)
+
     # Initialize trainer
     trainer = DomainAdaptiveTrainer(
         base_model=args.base_model if not args.resume_from else args.resume_from,
@@ -491,10 +666,20 @@ def main():
     )
 
     # Prepare dataset
-    train_dataset, val_dataset = trainer.prepare_dataset(
-        dataset_path=args.dataset,
-        max_length=args.max_length
-    )
+    if args.data_cache_dir and not args.streaming:
+        train_dataset, val_dataset = trainer.prepare_data(
+            dataset_path=args.dataset,
+            cache_dir=args.data_cache_dir,
+            max_length=args.max_length,
+            num_proc=args.num_proc
+        )
+    else:
+        train_dataset, val_dataset = trainer.prepare_dataset(
+            dataset_path=args.dataset,
+            max_length=args.max_length,
+            num_proc=args.num_proc,
+            streaming=args.streaming
+        )
 
     # Train
     result = trainer.train(
@@ -505,7 +690,9 @@ def main():
         learning_rate=args.learning_rate,
         warmup_ratio=args.warmup_ratio,
         gradient_accumulation_steps=args.gradient_accumulation,
-        fp16=args.fp16
+        fp16=args.fp16,
+        torch_compile=args.torch_compile,
+        max_steps=args.max_steps
     )
 
     # Evaluate if requested